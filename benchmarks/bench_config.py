@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark du chargement de la configuration
+Mesure le démarrage (import + chargement), le coût de la sérialisation vers les
+workers et le coût d'accès aux paramètres dans les boucles
+
+Usage: python benchmarks/bench_config.py [--config config.yaml] [--repeat 200]
+"""
+
+import argparse
+import pickle
+import statistics
+import subprocess
+import sys
+import timeit
+from pathlib import Path
+
+import yaml
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from src.config import Config
+
+COLD_START = "import time; t = time.perf_counter(); from src.config import Config; Config.load({path!r}); print(time.perf_counter() - t)"
+
+def cold_start(config_file: str, repeat: int) -> float:
+    """Import du module et chargement dans un interpréteur neuf (médiane, en secondes)"""
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", COLD_START.format(path=config_file)],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return statistics.median(timings)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark du chargement de la configuration")
+    parser.add_argument('--config', default=str(ROOT / "config.yaml"), help="Fichier de configuration")
+    parser.add_argument('--repeat', type=int, default=200, help="Nombre de chargements mesurés")
+    parser.add_argument('--cold', type=int, default=5, help="Nombre de démarrages à froid")
+    args = parser.parse_args(argv)
+
+    load_times = timeit.repeat(lambda: Config.load(args.config), number=1, repeat=args.repeat)
+    config = Config.load(args.config)
+
+    payload = pickle.dumps(config)
+    pickle_time = min(timeit.repeat(lambda: pickle.loads(pickle.dumps(config)), number=1000, repeat=5)) / 1000
+
+    # Accès dans une boucle chaude: attribut figé vs parcours des dictionnaires imbriqués
+    with open(args.config, 'r', encoding='utf-8') as f:
+        raw = yaml.safe_load(f) or {}
+    attribute = min(timeit.repeat(lambda: config.days_lookback, number=100000, repeat=5)) / 100000
+    nested = min(timeit.repeat(
+        lambda: raw.get('output', {}).get('days_lookback', 2), number=100000, repeat=5
+    )) / 100000
+
+    print(f"📊 Configuration: {args.config}")
+    print(f"🚀 Démarrage à froid (import + chargement): {cold_start(args.config, args.cold) * 1000:.2f} ms")
+    print(f"📄 Chargement + validation: médiane {statistics.median(load_times) * 1000:.3f} ms, "
+          f"min {min(load_times) * 1000:.3f} ms")
+    print(f"📦 Sérialisation pickle: {len(payload)} octets, aller-retour {pickle_time * 1e6:.1f} µs")
+    print(f"⚡ Accès à un paramètre: {attribute * 1e9:.0f} ns (dictionnaires imbriqués: {nested * 1e9:.0f} ns)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark des moteurs de sortie
+Compare le temps de génération et la taille des journaux PDF et EPUB
+
+Usage: python benchmarks/bench_output_engines.py [--items 200] [--repeat 5]
+"""
+
+import argparse
+import contextlib
+import io
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.config import Config
+from src.epub_generator import EPUBGenerator
+from src.pdf_generator import PDFGenerator
+from src.rss_aggregator import Article
+from src.youtube_summarizer import VideoSummary
+
+ENGINES = {
+    'pdf': PDFGenerator,
+    'epub': EPUBGenerator,
+}
+
+def synthetic_items(count: int):
+    """Générer des articles et résumés vidéos fictifs"""
+    now = datetime.now()
+    items = []
+    for i in range(count):
+        published = now - timedelta(minutes=i)
+        if i % 5 == 4:
+            items.append(VideoSummary(
+                title=f"Vidéo {i}: architecture & performance",
+                summary="Résumé de la vidéo. " * 40 + "\nPoints clés: " + "mesurer, profiler, optimiser. " * 10,
+                url=f"https://www.youtube.com/watch?v=video{i:06d}",
+                published=published,
+                source="YouTube",
+                channel_name=f"Chaîne {i % 7}"
+            ))
+        else:
+            content = "Contenu de l'article sur l'ingénierie logicielle. " * 20
+            items.append(Article(
+                title=f"Article {i}: les compromis <du> design",
+                content=content,
+                url=f"https://blog.example.com/{i // 10}/article-{i}?utm_source=rss",
+                published=published,
+                source=f"Blog {i % 11}",
+                summary=content[:200] + "..."
+            ))
+    return items
+
+def make_config(output_dir: Path, size_optimized: bool) -> Config:
+    """Configuration isolée écrivant dans un répertoire temporaire"""
+    return Config.from_dict({'output': {'output_dir': str(output_dir), 'size_optimized': size_optimized}})
+
+def bench_engine(name: str, config: Config, items, repeat: int):
+    """Mesurer le temps de génération (médiane et minimum) et la taille du fichier"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            # Un générateur neuf à chaque répétition: le cache des QR codes ne fausse pas la mesure
+            path = ENGINES[name](config).create_journal(items)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), min(timings), path.stat().st_size
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark des moteurs PDF et EPUB")
+    parser.add_argument('--items', type=int, default=200, help="Nombre d'éléments dans le journal")
+    parser.add_argument('--repeat', type=int, default=5, help="Nombre de générations par moteur")
+    parser.add_argument('--size-optimized', action='store_true', help="Activer la compression du PDF")
+    args = parser.parse_args(argv)
+
+    items = synthetic_items(args.items)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        config = make_config(Path(tmp), args.size_optimized)
+        for name in ENGINES:
+            results[name] = bench_engine(name, config, items, args.repeat)
+
+    print(f"📊 {args.items} éléments, {args.repeat} répétitions")
+    print(f"{'moteur':<8}{'médiane (s)':>14}{'min (s)':>10}{'taille (KB)':>14}")
+    for name, (median, best, size) in results.items():
+        print(f"{name:<8}{median:>14.3f}{best:>10.3f}{size / 1024:>14.1f}")
+
+    pdf_median, _, pdf_size = results['pdf']
+    epub_median, _, epub_size = results['epub']
+    print(f"⚡ EPUB: {pdf_median / epub_median:.1f}x plus rapide, "
+          f"{pdf_size / epub_size:.1f}x plus petit que le PDF")
+
+if __name__ == "__main__":
+    main()
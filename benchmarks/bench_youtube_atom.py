@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark du flux Atom YouTube
+Compare le parsing iterparse dédié à feedparser, et la récupération concurrente
+des flux (session partagée) à la récupération séquentielle, contre un serveur local
+
+Usage: python benchmarks/bench_youtube_atom.py [--channels 20] [--latency 0.1]
+"""
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+import timeit
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+import feedparser
+import requests
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.youtube_feed import create_session, fetch_channel_feeds, parse_channel_feed
+
+def synthetic_feed(channel_id: str, entries: int = 15) -> bytes:
+    """Flux au format renvoyé par https://www.youtube.com/feeds/videos.xml (15 vidéos)"""
+    now = datetime.now(timezone.utc)
+    items = []
+    for i in range(entries):
+        video_id = f"{channel_id[-4:]}vid{i:04d}"
+        published = (now - timedelta(hours=6 * i)).isoformat(timespec='seconds')
+        description = escape("Dans cette vidéo nous parlons d'architecture, de tests & de performance. " * 8)
+        items.append(f"""
+ <entry>
+  <id>yt:video:{video_id}</id>
+  <yt:videoId>{video_id}</yt:videoId>
+  <yt:channelId>{channel_id}</yt:channelId>
+  <title>Vidéo {i} &amp; démonstration</title>
+  <link rel="alternate" href="https://www.youtube.com/watch?v={video_id}"/>
+  <author>
+   <name>Chaîne {channel_id}</name>
+   <uri>https://www.youtube.com/channel/{channel_id}</uri>
+  </author>
+  <published>{published}</published>
+  <updated>{published}</updated>
+  <media:group>
+   <media:title>Vidéo {i} &amp; démonstration</media:title>
+   <media:content url="https://www.youtube.com/v/{video_id}?version=3" type="application/x-shockwave-flash" width="640" height="390"/>
+   <media:thumbnail url="https://i2.ytimg.com/vi/{video_id}/hqdefault.jpg" width="480" height="360"/>
+   <media:description>{description}</media:description>
+   <media:community>
+    <media:starRating count="1200" average="5.00" min="1" max="5"/>
+    <media:statistics views="45678"/>
+   </media:community>
+  </media:group>
+ </entry>""")
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" xmlns:media="http://search.yahoo.com/mrss/" xmlns="http://www.w3.org/2005/Atom">
+ <link rel="self" href="http://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"/>
+ <id>yt:channel:{channel_id}</id>
+ <yt:channelId>{channel_id}</yt:channelId>
+ <title>Chaîne {channel_id}</title>
+ <link rel="alternate" href="https://www.youtube.com/channel/{channel_id}"/>
+ <author>
+  <name>Chaîne {channel_id}</name>
+  <uri>https://www.youtube.com/channel/{channel_id}</uri>
+ </author>
+ <published>2015-01-01T00:00:00+00:00</published>{''.join(items)}
+</feed>""".encode('utf-8')
+
+def bench_parse(data: bytes, repeat: int):
+    """Temps de parsing d'un flux (médiane, en secondes)"""
+    fast = statistics.median(timeit.repeat(lambda: parse_channel_feed(data), number=10, repeat=repeat)) / 10
+    generic = statistics.median(timeit.repeat(lambda: feedparser.parse(data), number=10, repeat=repeat)) / 10
+
+    # Les deux parseurs doivent extraire les mêmes informations
+    parsed, reference = parse_channel_feed(data), feedparser.parse(data)
+    assert parsed.title == reference.feed.title
+    assert [entry.link for entry in parsed.entries] == [entry.link for entry in reference.entries]
+    return fast, generic
+
+def start_feed_server(latency: float) -> ThreadingHTTPServer:
+    """Serveur local simulant youtube.com avec une latence fixe par requête"""
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            time.sleep(latency)
+            body = synthetic_feed(self.path.rsplit('=', 1)[-1])
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/atom+xml')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def bench_fetch(channels: int, latency: float):
+    """Récupération séquentielle (une connexion par requête) vs concurrente (session partagée)"""
+    server = start_feed_server(latency)
+    url_template = f"http://127.0.0.1:{server.server_address[1]}/feeds/videos.xml?channel_id={{channel_id}}"
+    channel_ids = [f"UCbench{i:016d}" for i in range(channels)]
+
+    try:
+        started = time.perf_counter()
+        for channel_id in channel_ids:
+            feedparser.parse(requests.get(url_template.format(channel_id=channel_id), timeout=10).content)
+        sequential = time.perf_counter() - started
+
+        started = time.perf_counter()
+        with create_session() as session:
+            feeds = fetch_channel_feeds(session, channel_ids, url_template)
+        for data in feeds.values():
+            parse_channel_feed(data)
+        concurrent = time.perf_counter() - started
+    finally:
+        server.shutdown()
+    return sequential, concurrent
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark du flux Atom YouTube")
+    parser.add_argument('--channels', type=int, default=20, help="Nombre de chaînes récupérées")
+    parser.add_argument('--latency', type=float, default=0.1, help="Latence simulée par requête (s)")
+    parser.add_argument('--repeat', type=int, default=20, help="Répétitions du benchmark de parsing")
+    args = parser.parse_args(argv)
+
+    data = synthetic_feed("UCbenchmark000000000000")
+    fast, generic = bench_parse(data, args.repeat)
+    print(f"📊 Parsing d'un flux de 15 vidéos ({len(data) / 1024:.1f} KB)")
+    print(f"   iterparse:  {fast * 1000:.2f} ms")
+    print(f"   feedparser: {generic * 1000:.2f} ms ({generic / fast:.1f}x plus lent)")
+
+    sequential, concurrent = bench_fetch(args.channels, args.latency)
+    print(f"📡 Récupération + parsing de {args.channels} chaînes (latence {args.latency * 1000:.0f} ms)")
+    print(f"   séquentielle: {sequential:.2f} s (hors pause de 2 s par chaîne de l'ancienne version)")
+    print(f"   concurrente:  {concurrent:.2f} s ({sequential / concurrent:.1f}x plus rapide)")
+
+if __name__ == "__main__":
+    main()
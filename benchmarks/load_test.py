@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Test de charge du pipeline complet
+Exécute N profils × M flux contre des substituts locaux (serveur de flux RSS et
+YouTube, API OpenAI factice, serveur SMTP qui accepte et jette les emails) et
+mesure la latence de chaque étape (p50/p95), l'utilisation CPU, la mémoire
+maximale et la taille des journaux. Les seuils signalent les régressions
+(code de sortie 1).
+
+Les substituts tournent dans un processus séparé: le CPU, la mémoire et les
+latences mesurés sont ceux du pipeline seul. Avec --store, le contenu est
+d'abord ingéré (hors mesure) dans le stockage local de chaque profil, puis le
+journal est produit à partir de ce stockage.
+
+Usage: python benchmarks/load_test.py [--profiles 20] [--feeds 10] [--channels 3]
+       [--concurrency 4] [--store] [--max-p95 journal=5] [--max-memory-mb 500]
+       [--baseline report.json] [--json report.json]
+"""
+
+import argparse
+import base64
+import contextlib
+import io
+import json
+import math
+import multiprocessing
+import os
+import resource
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from bench_youtube_atom import synthetic_feed
+from main import TIMING_STORE, run
+from src.checkpoint import STAGE_ARTICLES, STAGE_VIDEOS, STAGE_JOURNAL, STAGE_DELIVERY
+from src.config import Config
+from src.ingestor import ContentIngestor
+
+STAGES = (STAGE_ARTICLES, STAGE_VIDEOS, TIMING_STORE, STAGE_JOURNAL, STAGE_DELIVERY, 'total')
+
+PARAGRAPH = ("Les systèmes distribués imposent des compromis entre cohérence, disponibilité "
+             "et latence; cet article détaille les choix d'architecture & leurs conséquences. ")
+
+def synthetic_rss(name: str, entries: int) -> bytes:
+    """Flux RSS 2.0 avec des articles récents (une entrée toutes les 2 heures)"""
+    now = datetime.now(timezone.utc)
+    items = []
+    for i in range(entries):
+        published = format_datetime(now - timedelta(hours=2 * i))
+        content = escape(f"<p>{PARAGRAPH * 6}</p>" * 4)
+        items.append(f"""
+  <item>
+   <title>{escape(name)}: article {i} &amp; performance</title>
+   <link>https://example.invalid/{name}/article-{i}</link>
+   <guid>https://example.invalid/{name}/article-{i}</guid>
+   <pubDate>{published}</pubDate>
+   <description>{content}</description>
+  </item>""")
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0">
+ <channel>
+  <title>Blog {escape(name)}</title>
+  <link>https://example.invalid/{name}</link>
+  <description>Flux synthétique du test de charge</description>{''.join(items)}
+ </channel>
+</rss>
+""".encode('utf-8')
+
+def chat_completion(model: str) -> bytes:
+    """Réponse minimale de l'API Chat Completions"""
+    summary = "Cette vidéo présente les points clés de l'architecture logicielle. " * 6
+    return json.dumps({
+        'id': 'chatcmpl-load-test',
+        'object': 'chat.completion',
+        'created': int(time.time()),
+        'model': model,
+        'choices': [{
+            'index': 0,
+            'message': {'role': 'assistant', 'content': summary},
+            'finish_reason': 'stop',
+        }],
+        'usage': {'prompt_tokens': 300, 'completion_tokens': 250, 'total_tokens': 550},
+    }).encode('utf-8')
+
+def start_http_server(feed_latency: float, llm_latency: float, entries: int) -> ThreadingHTTPServer:
+    """Substitut local des flux RSS, des flux YouTube et de l'API OpenAI"""
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def reply(self, body: bytes, content_type: str, status: int = 200):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            time.sleep(feed_latency)
+            if self.path.startswith('/rss/'):
+                self.reply(synthetic_rss(self.path[len('/rss/'):].replace('/', '-'), entries), 'application/rss+xml')
+            elif self.path.startswith('/youtube/'):
+                self.reply(synthetic_feed(self.path.rsplit('=', 1)[-1]), 'application/atom+xml')
+            else:
+                self.reply(b'not found', 'text/plain', 404)
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            time.sleep(llm_latency)
+            if self.path.endswith('/chat/completions'):
+                self.reply(chat_completion(request.get('model', '')), 'application/json')
+            else:
+                self.reply(b'{}', 'application/json', 404)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    """Serveur SMTP minimal: accepte toute authentification et jette les messages"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), SMTPHandler)
+        self.lock = threading.Lock()
+        self.messages = 0
+        self.bytes = 0
+
+    def record(self, size: int):
+        with self.lock:
+            self.messages += 1
+            self.bytes += size
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    """Dialogue SMTP (EHLO, AUTH, MAIL, RCPT, DATA, QUIT) sans TLS"""
+
+    def send(self, line: str):
+        self.wfile.write(line.encode('ascii') + b'\r\n')
+
+    def handle(self):
+        self.send("220 localhost ESMTP load-test")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('ascii', 'replace').strip().upper()
+            verb = command.split(' ', 1)[0]
+
+            if verb == 'EHLO':
+                self.send("250-localhost")
+                self.send("250-AUTH PLAIN")
+                self.send("250 8BITMIME")
+            elif verb == 'HELO':
+                self.send("250 localhost")
+            elif verb == 'AUTH':
+                if command == 'AUTH PLAIN':
+                    self.send("334 ")
+                    self.rfile.readline()
+                self.send("235 2.7.0 Authentication successful")
+            elif verb in ('MAIL', 'RCPT', 'RSET', 'NOOP'):
+                self.send("250 OK")
+            elif verb == 'DATA':
+                self.send("354 End data with <CR><LF>.<CR><LF>")
+                size = 0
+                for data in iter(self.rfile.readline, b''):
+                    if data in (b'.\r\n', b'.\n'):
+                        break
+                    size += len(data)
+                self.server.record(size)
+                self.send("250 OK: queued")
+            elif verb == 'QUIT':
+                self.send("221 Bye")
+                return
+            else:
+                self.send("502 Command not implemented")
+
+def serve_stand_ins(conn, feed_latency: float, llm_latency: float, entries: int):
+    """Processus des substituts: publie les ports, sert jusqu'à l'arrêt puis renvoie les compteurs SMTP"""
+    http_server = start_http_server(feed_latency, llm_latency, entries)
+    sink = SMTPSink()
+    threading.Thread(target=sink.serve_forever, daemon=True).start()
+    conn.send((http_server.server_address[1], sink.server_address[1]))
+
+    conn.recv()
+    http_server.shutdown()
+    sink.shutdown()
+    conn.send({'messages': sink.messages, 'bytes': sink.bytes})
+
+def profile_config(index: int, args, base_url: str, smtp_port: int, root: Path) -> Config:
+    """Configuration d'un profil (indépendante de config.yaml et de l'environnement)"""
+    name = f"profile{index:03d}"
+    return Config.from_dict({
+        'rss_feeds': [f"{base_url}/rss/{name}/feed{feed:03d}" for feed in range(args.feeds)],
+        'youtube_channels': [f"UCload{index:04d}{channel:012d}" for channel in range(args.channels)],
+        'openai': {
+            'api_key': 'load-test',
+            'base_url': f"{base_url}/v1",
+        },
+        'kindle': {
+            'email': f"{name}@kindle.invalid",
+            'sender_email': 'load-test@example.invalid',
+            'smtp_server': '127.0.0.1',
+            'smtp_port': smtp_port,
+            'smtp_password': base64.b64encode(name.encode()).decode(),
+            'starttls': False,
+        },
+        'output': {
+            'output_dir': str(root / name),
+            'format': args.format,
+            'size_optimized': args.size_optimized,
+            'max_articles_per_feed': args.articles,
+            'max_video_summaries': args.channels * 2,
+            'workers': args.workers,
+        },
+        'store': {
+            'enabled': args.store,
+            'path': str(root / name / 'content.db'),
+        },
+        'network': {
+            'rss_request_delay': 0,
+            'youtube_feed_url': f"{base_url}/youtube/feeds/videos.xml?channel_id={{channel_id}}",
+        },
+    }, environ={})
+
+def ingest_profile(config: Config) -> int:
+    """Alimenter le stockage local d'un profil (mode --store, hors mesure)"""
+    ingestor = ContentIngestor(config)
+    try:
+        return ingestor.run_once()
+    finally:
+        ingestor.store.close()
+
+def run_profile(config: Config) -> dict:
+    """Exécuter le pipeline d'un profil et mesurer chaque étape"""
+    timings = {}
+    started = time.perf_counter()
+    status = run(config, run_id='load-test', fresh=True, timings=timings)
+    timings['total'] = time.perf_counter() - started
+    journals = list(config.output_dir.glob('journal_apprentissage_*'))
+    return {
+        'status': status,
+        'timings': timings,
+        'output_bytes': sum(path.stat().st_size for path in journals),
+    }
+
+def pipeline_output(args):
+    """Sortie du pipeline: affichée avec --verbose, masquée sinon"""
+    return contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+
+def stage_limit(text: str):
+    """Parser un seuil `ÉTAPE=SECONDES` (option --max-p95)"""
+    stage, sep, seconds = text.partition('=')
+    if not sep or stage not in STAGES:
+        raise argparse.ArgumentTypeError(f"attendu ÉTAPE=SECONDES avec ÉTAPE parmi {', '.join(STAGES)}: {text!r}")
+    try:
+        return stage, float(seconds)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"durée invalide: {seconds!r}") from None
+
+def percentile(values, pct: float) -> float:
+    """Percentile par la méthode du rang le plus proche"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+def cpu_seconds() -> float:
+    """Temps CPU consommé par ce processus et ses workers terminés"""
+    total = 0.0
+    for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+        usage = resource.getrusage(who)
+        total += usage.ru_utime + usage.ru_stime
+    return total
+
+def peak_memory_mb() -> float:
+    """Mémoire résidente maximale (processus principal ou plus gros worker terminé)"""
+    peak = max(resource.getrusage(who).ru_maxrss for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN))
+    # ru_maxrss est en KB sous Linux, en octets sous macOS
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+def build_report(results, wall: float, cpu: float, memory: float, emails: dict, args) -> dict:
+    """Agréger les mesures de tous les profils"""
+    stages = {}
+    for stage in STAGES:
+        values = [result['timings'][stage] for result in results if stage in result['timings']]
+        if not values:
+            # Étape absente de ce mode (collecte directe ou lecture du stockage)
+            continue
+        stages[stage] = {
+            'p50': percentile(values, 50),
+            'p95': percentile(values, 95),
+            'max': max(values, default=0.0),
+        }
+    outputs = [result['output_bytes'] for result in results]
+    return {
+        'profiles': args.profiles,
+        'feeds': args.feeds,
+        'channels': args.channels,
+        'concurrency': args.concurrency,
+        'format': args.format,
+        'store': args.store,
+        'failures': sum(1 for result in results if result['status'] != 0),
+        'wall_seconds': wall,
+        'cpu_percent': 100 * cpu / wall / (os.cpu_count() or 1) if wall else 0.0,
+        'peak_memory_mb': memory,
+        'output_mb_total': sum(outputs) / 1024 / 1024,
+        'output_mb_max': max(outputs, default=0) / 1024 / 1024,
+        'emails': emails['messages'],
+        'email_mb': emails['bytes'] / 1024 / 1024,
+        'stages': stages,
+    }
+
+def check_thresholds(report: dict, args) -> list:
+    """Lister les seuils dépassés (et les régressions par rapport à la référence)"""
+    violations = []
+    if report['failures']:
+        violations.append(f"{report['failures']} profil(s) en échec")
+    if report['emails'] < report['profiles']:
+        violations.append(f"{report['emails']} email(s) reçus pour {report['profiles']} profils")
+
+    for stage, seconds in args.max_p95:
+        p95 = report['stages'].get(stage, {}).get('p95', 0.0)
+        if p95 > seconds:
+            violations.append(f"p95 {stage}: {p95:.2f} s > {seconds:.2f} s")
+
+    if args.max_memory_mb is not None and report['peak_memory_mb'] > args.max_memory_mb:
+        violations.append(f"mémoire max: {report['peak_memory_mb']:.0f} MB > {args.max_memory_mb:.0f} MB")
+    if args.max_output_mb is not None and report['output_mb_max'] > args.max_output_mb:
+        violations.append(f"journal le plus lourd: {report['output_mb_max']:.2f} MB > {args.max_output_mb:.2f} MB")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        allowed = 1 + args.tolerance
+        for stage, values in baseline.get('stages', {}).items():
+            current = report['stages'].get(stage, {}).get('p95', 0.0)
+            # Ignorer les étapes trop courtes pour être mesurées de façon fiable
+            if values['p95'] >= 0.05 and current > values['p95'] * allowed:
+                violations.append(f"régression p95 {stage}: {current:.2f} s (référence {values['p95']:.2f} s)")
+        for key in ('peak_memory_mb', 'output_mb_max'):
+            if baseline.get(key) and report[key] > baseline[key] * allowed:
+                violations.append(f"régression {key}: {report[key]:.2f} (référence {baseline[key]:.2f})")
+    return violations
+
+def print_report(report: dict):
+    print(f"📊 {report['profiles']} profils × {report['feeds']} flux + {report['channels']} chaînes "
+          f"({report['format'].upper()}{', stockage local' if report['store'] else ''}, "
+          f"{report['concurrency']} en parallèle)")
+    print(f"   {'étape':<10} {'p50':>8} {'p95':>8} {'max':>8}")
+    for stage, values in report['stages'].items():
+        print(f"   {stage:<10} {values['p50']:>7.2f}s {values['p95']:>7.2f}s {values['max']:>7.2f}s")
+    print(f"⏱️ Durée totale: {report['wall_seconds']:.1f} s, CPU: {report['cpu_percent']:.0f}% "
+          f"de {os.cpu_count()} cœur(s)")
+    print(f"🧠 Mémoire max: {report['peak_memory_mb']:.0f} MB")
+    print(f"📦 Journaux: {report['output_mb_total']:.2f} MB au total, {report['output_mb_max']:.2f} MB au plus")
+    print(f"📧 Emails reçus: {report['emails']} ({report['email_mb']:.2f} MB)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Test de charge du pipeline complet")
+    parser.add_argument('--profiles', type=int, default=20, help="Nombre de profils (destinataires)")
+    parser.add_argument('--feeds', type=int, default=10, help="Flux RSS par profil")
+    parser.add_argument('--channels', type=int, default=3, help="Chaînes YouTube par profil")
+    parser.add_argument('--articles', type=int, default=3, help="Articles retenus par flux")
+    parser.add_argument('--entries', type=int, default=20, help="Entrées par flux RSS synthétique")
+    parser.add_argument('--concurrency', type=int, default=4, help="Profils exécutés en parallèle")
+    parser.add_argument('--format', choices=('pdf', 'epub'), default='pdf', help="Format du journal")
+    parser.add_argument('--size-optimized', action='store_true', help="Activer output.size_optimized")
+    parser.add_argument('--store', action='store_true',
+                        help="Ingérer d'abord le contenu, puis produire le journal depuis le stockage local")
+    parser.add_argument('--workers', type=int, default=1, help="Processus de préparation du PDF par profil")
+    parser.add_argument('--feed-latency', type=float, default=0.05, help="Latence simulée des flux (s)")
+    parser.add_argument('--llm-latency', type=float, default=0.2, help="Latence simulée de l'API OpenAI (s)")
+    parser.add_argument('--max-p95', action='append', default=[], type=stage_limit, metavar='ÉTAPE=SECONDES',
+                        help=f"Seuil de latence p95 d'une étape ({', '.join(STAGES)}), répétable")
+    parser.add_argument('--max-memory-mb', type=float, help="Seuil de mémoire maximale")
+    parser.add_argument('--max-output-mb', type=float, help="Seuil de taille du plus gros journal")
+    parser.add_argument('--baseline', help="Rapport JSON de référence à ne pas dépasser")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Marge autorisée sur la référence (0.2 = +20%%)")
+    parser.add_argument('--json', help="Écrire le rapport JSON (utilisable comme référence)")
+    parser.add_argument('--verbose', action='store_true', help="Afficher la sortie du pipeline")
+    args = parser.parse_args(argv)
+
+    conn, child_conn = multiprocessing.Pipe()
+    stand_ins = multiprocessing.Process(
+        target=serve_stand_ins, args=(child_conn, args.feed_latency, args.llm_latency, args.entries), daemon=True
+    )
+    stand_ins.start()
+    http_port, smtp_port = conn.recv()
+    base_url = f"http://127.0.0.1:{http_port}"
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            configs = [profile_config(index, args, base_url, smtp_port, Path(tmp)) for index in range(args.profiles)]
+            if args.store:
+                with pipeline_output(args), ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+                    list(executor.map(ingest_profile, configs))
+
+            cpu_started, started = cpu_seconds(), time.perf_counter()
+            with pipeline_output(args), ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+                results = list(executor.map(run_profile, configs))
+            wall, cpu = time.perf_counter() - started, cpu_seconds() - cpu_started
+            # Mesurée avant l'arrêt des substituts, qui ne comptent donc pas parmi les processus terminés
+            memory = peak_memory_mb()
+    finally:
+        conn.send('stop')
+        emails = conn.recv()
+        stand_ins.join()
+
+    report = build_report(results, wall, cpu, memory, emails, args)
+    print_report(report)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Rapport écrit: {args.json}")
+
+    violations = check_thresholds(report, args)
+    if violations:
+        print("❌ Seuils dépassés:")
+        for violation in violations:
+            print(f"   - {violation}")
+        return 1
+    print("✅ Aucun seuil dépassé")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,62 +7,223 @@ Envoi automatique vers Kindle
 
 import os
 import sys
+import time
+import argparse
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
+from typing import Dict, List, Optional
 
 # Ajouter src au path
 sys.path.append(str(Path(__file__).parent / "src"))
 
 from src.rss_aggregator import RSSAggregator
 from src.youtube_summarizer import YouTubeSummarizer
-from src.pdf_generator import PDFGenerator
+from src.journal_generator import create_generator
 from src.kindle_sender import KindleSender
-from src.config import Config
+from src.config import Config, ConfigError
+from src.checkpoint import RunCheckpoint, STAGE_ARTICLES, STAGE_VIDEOS, STAGE_JOURNAL, STAGE_DELIVERY
 
-def main():
+# Mesure de la lecture du stockage local, qui remplace les étapes articles et vidéos
+TIMING_STORE = "store"
+
+@contextmanager
+def timed(timings: Dict[str, float], stage: str):
+    """Mesurer la durée d'une étape"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - started
+
+def resume_stage(checkpoint: RunCheckpoint, stage: str, label: str):
+    """Éléments déjà obtenus et sources à réessayer d'une étape partielle (None: toutes)"""
+    if not checkpoint.has(stage):
+        return [], None
+    previous, failed = checkpoint.load_items(stage), checkpoint.failed(stage)
+    print(f"♻️ Reprise: {len(previous)} éléments, {len(failed)} {label} à réessayer")
+    return previous, failed
+
+def report_failures(failed: List[str], label: str):
+    """Signaler les sources en échec, réessayées à la prochaine tentative"""
+    if failed:
+        print(f"⚠️ {len(failed)} {label} en échec, réessayé(s) à la prochaine exécution: {', '.join(failed)}")
+
+def parse_args(argv=None):
+    """Analyser les arguments de la ligne de commande"""
+    parser = argparse.ArgumentParser(description="Système d'Apprentissage Automatique")
+    parser.add_argument('--ingest', action='store_true',
+                        help="Alimenter le stockage local en continu au lieu de générer le journal")
+    parser.add_argument('--ingest-once', action='store_true',
+                        help="Interroger toutes les sources une seule fois vers le stockage local")
+    parser.add_argument('--recipient',
+                        help="Destinataire défini dans la section `recipients` de config.yaml")
+    parser.add_argument('--run-id',
+                        help="Identifiant de l'exécution à reprendre (par défaut: la date du jour)")
+    parser.add_argument('--fresh', action='store_true',
+                        help="Ignorer les points de reprise et tout recommencer")
+    return parser.parse_args(argv)
+
+def ingest(config, once: bool) -> int:
+    """Mode ingestion: alimenter le stockage local"""
+    from src.ingestor import ContentIngestor
+    
+    ingestor = ContentIngestor(config)
+    if not once:
+        ingestor.run_forever()
+        return 0
+    
+    try:
+        count = ingestor.run_once()
+        print(f"✅ {count} nouveaux éléments ingérés ({ingestor.store.count()} en stock)")
+    finally:
+        ingestor.store.close()
+    return 0
+
+def load_from_store(config):
+    """Lire le contenu récent depuis le stockage local"""
+    from src.content_store import ContentStore
+    from src.dates import cutoff
+    
+    store = ContentStore(config.store_path, config.store_batch_size)
+    try:
+        since = cutoff(config.days_lookback)
+        articles = store.get_articles(since, feeds=config.rss_feeds, per_feed=config.max_articles_per_feed)
+        video_summaries = store.get_video_summaries(
+            since, limit=config.max_video_summaries, channels=config.youtube_channels, per_channel=2
+        )
+    finally:
+        store.close()
+    return articles, video_summaries
+
+def main(argv=None):
     """Fonction principale pour orchestrer le système d'apprentissage"""
+    args = parse_args(argv)
     print("🧠 Démarrage du Système d'Apprentissage Automatique...")
     
-    # Initialiser la configuration
-    config = Config()
+    # Initialiser la configuration (lue et validée une seule fois)
+    try:
+        config = Config.load(recipient=args.recipient)
+    except ConfigError as e:
+        print(f"❌ {e}")
+        return 1
+    
+    if args.ingest or args.ingest_once:
+        return ingest(config, once=args.ingest_once)
+    
+    return run(config, run_id=args.run_id, fresh=args.fresh)
+
+def run(config, run_id: Optional[str] = None, fresh: bool = False,
+        timings: Optional[Dict[str, float]] = None) -> int:
+    """Exécuter le pipeline complet (collecte, résumés, journal, envoi)
+    
+    La durée de chaque étape est ajoutée à `timings` si fourni.
+    """
+    timings = {} if timings is None else timings
+    
+    # Points de reprise: une nouvelle tentative reprend après la dernière étape terminée
+    checkpoint = RunCheckpoint(config.output_dir, run_id)
+    if fresh:
+        checkpoint.clear()
     
     # Initialiser les composants
     rss_aggregator = RSSAggregator(config)
     youtube_summarizer = YouTubeSummarizer(config)
-    pdf_generator = PDFGenerator(config)
+    journal_generator = create_generator(config)
     kindle_sender = KindleSender(config)
     
     try:
-        # Étape 1: Collecter les articles RSS
-        print("📰 Collecte des articles RSS...")
-        articles = rss_aggregator.collect_articles()
-        print(f"✅ {len(articles)} articles collectés")
+        journal_paths = checkpoint.load_journal()
+        if journal_paths and all(checkpoint.is_delivered(path) for path in journal_paths):
+            print(f"✅ Journal déjà envoyé (exécution {checkpoint.run_id})")
+            return 0
         
-        # Étape 2: Traiter les vidéos YouTube
-        print("🎥 Traitement des vidéos YouTube...")
-        video_summaries = youtube_summarizer.process_videos()
-        print(f"✅ {len(video_summaries)} résumés de vidéos générés")
+        # Le contenu est (re)collecté lors de cette tentative: un journal non envoyé sera régénéré
+        refreshed = True
+        if checkpoint.is_complete(STAGE_ARTICLES) and checkpoint.is_complete(STAGE_VIDEOS):
+            # Étapes 1-2 déjà terminées lors d'une tentative précédente
+            articles = checkpoint.load_items(STAGE_ARTICLES)
+            video_summaries = checkpoint.load_items(STAGE_VIDEOS)
+            print(f"♻️ Reprise: {len(articles)} articles et {len(video_summaries)} résumés de vidéos")
+            refreshed = False
+        elif config.store_enabled:
+            # Étapes 1-2: Le contenu a déjà été ingéré au fil de la journée
+            print("🗄️ Lecture du contenu depuis le stockage local...")
+            with timed(timings, TIMING_STORE):
+                articles, video_summaries = load_from_store(config)
+            checkpoint.save_items(STAGE_ARTICLES, articles)
+            checkpoint.save_items(STAGE_VIDEOS, video_summaries)
+            print(f"✅ {len(articles)} articles et {len(video_summaries)} résumés de vidéos en stock")
+        else:
+            # Étape 1: Collecter les articles RSS (seuls les flux en échec sont réinterrogés)
+            if checkpoint.is_complete(STAGE_ARTICLES):
+                articles = checkpoint.load_items(STAGE_ARTICLES)
+                print(f"♻️ Reprise: {len(articles)} articles")
+            else:
+                previous, feeds = resume_stage(checkpoint, STAGE_ARTICLES, "flux")
+                print("📰 Collecte des articles RSS...")
+                with timed(timings, STAGE_ARTICLES):
+                    articles = rss_aggregator.collect_articles(feeds, previous)
+                checkpoint.save_items(STAGE_ARTICLES, articles, failed=rss_aggregator.failed_feeds)
+                print(f"✅ {len(articles)} articles collectés")
+                report_failures(rss_aggregator.failed_feeds, "flux RSS")
+            
+            # Étape 2: Traiter les vidéos YouTube (seules les chaînes en échec sont retraitées)
+            if checkpoint.is_complete(STAGE_VIDEOS):
+                video_summaries = checkpoint.load_items(STAGE_VIDEOS)
+                print(f"♻️ Reprise: {len(video_summaries)} résumés de vidéos")
+            else:
+                previous, channels = resume_stage(checkpoint, STAGE_VIDEOS, "chaîne(s)")
+                print("🎥 Traitement des vidéos YouTube...")
+                with timed(timings, STAGE_VIDEOS):
+                    video_summaries = youtube_summarizer.process_videos(channels, previous)
+                checkpoint.save_items(STAGE_VIDEOS, video_summaries, failed=youtube_summarizer.failed_channels)
+                print(f"✅ {len(video_summaries)} résumés de vidéos générés")
+                report_failures(youtube_summarizer.failed_channels, "chaîne(s) YouTube")
         
         # Étape 3: Combiner tout le contenu
         all_content = articles + video_summaries
         
         if not all_content:
+            # Ne pas figer un résultat vide (panne réseau?): la prochaine tentative recollecte tout
+            checkpoint.discard(STAGE_ARTICLES, STAGE_VIDEOS)
             print("⚠️ Aucun contenu trouvé pour aujourd'hui")
             return 0
         
-        # Étape 4: Générer le PDF avec QR codes
-        print("📄 Génération du journal PDF...")
-        pdf_path = pdf_generator.create_journal(all_content)
+        # Étape 4: Générer le journal (PDF avec QR codes ou EPUB)
+        if journal_paths and refreshed and not any(checkpoint.is_delivered(path) for path in journal_paths):
+            # Le contenu a pu être complété depuis: régénérer le journal qui n'a pas été envoyé
+            checkpoint.discard(STAGE_JOURNAL)
+            journal_paths = None
+        if journal_paths:
+            print(f"♻️ Reprise: journal déjà généré ({len(journal_paths)} fichier(s))")
+        else:
+            print(f"📄 Génération du journal {config.output_format.upper()}...")
+            with timed(timings, STAGE_JOURNAL):
+                journal_paths = journal_generator.create_journal_volumes(all_content)
+            checkpoint.save_journal(journal_paths)
         
-        # Étape 5: Envoyer vers Kindle
+        # Étape 5: Envoyer vers Kindle (un email par volume, jamais deux fois)
         print("📧 Envoi vers Kindle...")
-        success = kindle_sender.send_to_kindle(pdf_path)
+        success = True
+        with timed(timings, STAGE_DELIVERY):
+            for journal_path in journal_paths:
+                if checkpoint.is_delivered(journal_path):
+                    print(f"♻️ Déjà envoyé: {journal_path.name}")
+                    continue
+                if not kindle_sender.send_to_kindle(journal_path):
+                    success = False
+                    break
+                checkpoint.mark_delivered(journal_path)
         
         if success:
             print("✅ Journal quotidien envoyé avec succès vers Kindle!")
         else:
-            print("⚠️ Erreur lors de l'envoi vers Kindle, mais le PDF est disponible localement")
-            print(f"📁 Fichier généré: {pdf_path}")
+            print("⚠️ Erreur lors de l'envoi vers Kindle, mais le journal est disponible localement")
+            for journal_path in journal_paths:
+                print(f"📁 Fichier généré: {journal_path}")
+            resume = f" --recipient {config.recipient}" if config.recipient else ""
+            print(f"ℹ️ Relancez `python main.py{resume} --run-id {checkpoint.run_id}` pour reprendre l'envoi")
         
     except Exception as e:
         print(f"❌ Erreur: {e}")
@@ -57,7 +57,7 @@ def test_configuration():
     print("🧪 Test de la configuration...")
     
     try:
-        config = Config()
+        config = Config.load()
         print("✅ Configuration chargée avec succès")
         
         print(f"📰 Flux RSS configurés: {len(config.rss_feeds)}")
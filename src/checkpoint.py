@@ -0,0 +1,116 @@
+"""
+Points de reprise d'une exécution
+Sauvegarde la sortie de chaque étape pour reprendre une exécution interrompue
+"""
+
+import json
+import os
+import shutil
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .dates import ensure_utc
+from .rss_aggregator import Article
+from .youtube_summarizer import VideoSummary
+
+STAGE_ARTICLES = "articles"
+STAGE_VIDEOS = "videos"
+STAGE_JOURNAL = "journal"
+STAGE_DELIVERY = "delivery"
+
+def item_to_dict(item) -> Dict[str, Any]:
+    """Sérialiser un article ou un résumé vidéo"""
+    data = asdict(item)
+    data['published'] = item.published.isoformat()
+    data['kind'] = 'video' if isinstance(item, VideoSummary) else 'article'
+    return data
+
+def item_from_dict(data: Dict[str, Any]):
+    """Reconstruire un article ou un résumé vidéo"""
+    data = dict(data)
+    kind = data.pop('kind', 'article')
+    data['published'] = ensure_utc(datetime.fromisoformat(data['published']))
+    return VideoSummary(**data) if kind == 'video' else Article(**data)
+
+class RunCheckpoint:
+    """Points de reprise d'une exécution, identifiée par son run ID"""
+    
+    def __init__(self, output_dir: Path, run_id: Optional[str] = None):
+        # Par défaut une exécution par jour: relancer le même jour reprend l'exécution
+        self.run_id = run_id or datetime.now().strftime("%Y-%m-%d")
+        self.run_dir = Path(output_dir) / "runs" / self.run_id
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+    
+    def stage_path(self, stage: str) -> Path:
+        return self.run_dir / f"{stage}.json"
+    
+    def has(self, stage: str) -> bool:
+        """Vérifier si une étape est terminée"""
+        return self.stage_path(stage).exists()
+    
+    def save(self, stage: str, data: Any):
+        """Enregistrer la sortie d'une étape (écriture atomique)"""
+        path = self.stage_path(stage)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    
+    def load(self, stage: str, default: Any = None) -> Any:
+        """Lire la sortie d'une étape"""
+        if not self.has(stage):
+            return default
+        with open(self.stage_path(stage), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def save_items(self, stage: str, items: List, failed: Iterable[str] = ()):
+        """Enregistrer les éléments d'une étape et les sources en échec (à réessayer)"""
+        self.save(stage, {
+            'items': [item_to_dict(item) for item in items],
+            'failed': list(failed),
+        })
+    
+    def load_items(self, stage: str) -> List:
+        return [item_from_dict(item) for item in self.load(stage, {}).get('items', [])]
+    
+    def failed(self, stage: str) -> List[str]:
+        """Sources (flux, chaînes) en échec lors de la dernière tentative de l'étape"""
+        return list(self.load(stage, {}).get('failed', []))
+    
+    def is_complete(self, stage: str) -> bool:
+        """Vérifier si une étape est terminée sans aucune source en échec"""
+        return self.has(stage) and not self.failed(stage)
+    
+    def discard(self, *stages: str):
+        """Oublier des étapes pour qu'elles soient refaites à la prochaine tentative"""
+        for stage in stages:
+            self.stage_path(stage).unlink(missing_ok=True)
+    
+    def save_journal(self, paths: List[Path]):
+        self.save(STAGE_JOURNAL, [str(path) for path in paths])
+    
+    def load_journal(self) -> Optional[List[Path]]:
+        """Fichiers du journal déjà générés (None s'ils sont absents ou incomplets)"""
+        paths = [Path(path) for path in self.load(STAGE_JOURNAL, [])]
+        if not paths or not all(path.exists() for path in paths):
+            return None
+        return paths
+    
+    def is_delivered(self, path: Path) -> bool:
+        """Vérifier si un fichier a déjà été envoyé"""
+        return Path(path).name in self.load(STAGE_DELIVERY, {})
+    
+    def mark_delivered(self, path: Path):
+        """Noter l'envoi d'un fichier, immédiatement, pour ne jamais l'envoyer deux fois"""
+        delivered = self.load(STAGE_DELIVERY, {})
+        delivered[Path(path).name] = datetime.now().isoformat()
+        self.save(STAGE_DELIVERY, delivered)
+    
+    def clear(self):
+        """Supprimer tous les points de reprise de l'exécution"""
+        shutil.rmtree(self.run_dir, ignore_errors=True)
+        self.run_dir.mkdir(parents=True, exist_ok=True)
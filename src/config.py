@@ -1,106 +1,284 @@
 """
 Gestion de la configuration pour le système d'apprentissage
+La configuration est lue et validée une seule fois, puis figée
 """
 
+import difflib
 import os
+from dataclasses import dataclass, fields
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 import yaml
 
-class Config:
-    """Classe de configuration pour le système d'apprentissage"""
-    
-    def __init__(self, config_file: str = "config.yaml"):
-        self.config_file = Path(config_file)
-        self.load_config()
-    
-    def load_config(self):
-        """Charger la configuration depuis le fichier YAML"""
-        if self.config_file.exists():
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                self._config = yaml.safe_load(f)
-        else:
-            self._config = self.get_default_config()
-            self.save_config()
-    
-    def save_config(self):
-        """Sauvegarder la configuration actuelle dans le fichier"""
-        with open(self.config_file, 'w', encoding='utf-8') as f:
-            yaml.dump(self._config, f, default_flow_style=False, allow_unicode=True)
-    
-    def get_default_config(self) -> Dict[str, Any]:
-        """Obtenir la configuration par défaut"""
-        return {
-            'rss_feeds': [
-                'https://feeds.feedburner.com/oreilly',
-                'https://blog.pragmaticengineer.com/rss/',
-                'https://martinfowler.com/feed.atom',
-                'https://hbr.org/feed',
-                'https://feeds.harvard.edu/blog/gazette'
-            ],
-            'youtube_channels': [
-                # Remplacer par de vrais IDs de chaînes YouTube
-                # Pour trouver l'ID: aller sur la chaîne > voir le code source > chercher "channelId"
-            ],
-            'openai': {
-                'api_key': os.getenv('OPENAI_API_KEY', ''),
-                'model': 'gpt-4o-mini'  # Modèle plus économique
-            },
-            'kindle': {
-                'email': os.getenv('KINDLE_EMAIL', ''),
-                'sender_email': os.getenv('SENDER_EMAIL', ''),
-                'smtp_server': 'smtp.gmail.com',
-                'smtp_port': 587,
-                'smtp_password': os.getenv('SMTP_PASSWORD', '')
-            },
-            'output': {
-                'output_dir': 'output',
-                'max_articles_per_feed': 3,
-                'max_video_summaries': 2,
-                'days_lookback': 2  # Nombre de jours à regarder en arrière
-            }
-        }
+# Le chargeur C de PyYAML (libyaml) est bien plus rapide quand il est disponible
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+ENV_PREFIX = "LEARNING_"
+
+class ConfigError(ValueError):
+    """Configuration invalide"""
+
+@dataclass(frozen=True)
+class Setting:
+    """Entrée du schéma: emplacement dans le YAML, type, valeur par défaut et contraintes"""
+    name: str
+    section: Optional[str]
+    key: str
+    type: type
+    default: Any
+    env: Optional[str] = None
+    minimum: Optional[float] = None
+    choices: Optional[Tuple[str, ...]] = None
     
     @property
-    def rss_feeds(self) -> List[str]:
-        return self._config.get('rss_feeds', [])
+    def path(self) -> str:
+        """Chemin du paramètre dans le YAML (ex: output.days_lookback)"""
+        return f"{self.section}.{self.key}" if self.section else self.key
     
     @property
-    def youtube_channels(self) -> List[str]:
-        return self._config.get('youtube_channels', [])
+    def env_var(self) -> str:
+        """Variable d'environnement qui surcharge ce paramètre"""
+        if self.env:
+            return self.env
+        parts = [self.section, self.key] if self.section else [self.key]
+        return ENV_PREFIX + "_".join(parts).upper()
+
+SCHEMA: Tuple[Setting, ...] = (
+    Setting('rss_feeds', None, 'rss_feeds', list, (
+        'https://feeds.feedburner.com/oreilly',
+        'https://blog.pragmaticengineer.com/rss/',
+        'https://martinfowler.com/feed.atom',
+        'https://hbr.org/feed',
+        'https://feeds.harvard.edu/blog/gazette'
+    )),
+    Setting('youtube_channels', None, 'youtube_channels', list, ()),
+    Setting('openai_api_key', 'openai', 'api_key', str, '', env='OPENAI_API_KEY'),
+    Setting('openai_model', 'openai', 'model', str, 'gpt-4o-mini'),
+    Setting('openai_base_url', 'openai', 'base_url', str, ''),
+    Setting('kindle_email', 'kindle', 'email', str, '', env='KINDLE_EMAIL'),
+    Setting('sender_email', 'kindle', 'sender_email', str, '', env='SENDER_EMAIL'),
+    Setting('smtp_server', 'kindle', 'smtp_server', str, 'smtp.gmail.com'),
+    Setting('smtp_port', 'kindle', 'smtp_port', int, 587, minimum=1),
+    Setting('smtp_password', 'kindle', 'smtp_password', str, '', env='SMTP_PASSWORD'),
+    Setting('smtp_starttls', 'kindle', 'starttls', bool, True),
+    Setting('output_dir', 'output', 'output_dir', Path, Path('output')),
+    Setting('max_articles_per_feed', 'output', 'max_articles_per_feed', int, 3, minimum=0),
+    Setting('max_video_summaries', 'output', 'max_video_summaries', int, 2, minimum=0),
+    Setting('days_lookback', 'output', 'days_lookback', int, 2, minimum=1),
+    Setting('output_format', 'output', 'format', str, 'pdf', choices=('pdf', 'epub')),
+    Setting('size_optimized', 'output', 'size_optimized', bool, False),
+    Setting('pdf_layout', 'output', 'layout', str, 'standard', choices=('standard', 'compact')),
+    Setting('max_volume_mb', 'output', 'max_volume_mb', float, 24.0, minimum=1),
+    Setting('pdf_workers', 'output', 'workers', int, 0, minimum=0),
+    Setting('store_enabled', 'store', 'enabled', bool, False),
+    Setting('store_path', 'store', 'path', Path, Path('output/content.db')),
+    Setting('poll_interval_minutes', 'store', 'poll_interval_minutes', int, 60, minimum=1),
+    Setting('store_batch_size', 'store', 'batch_size', int, 50, minimum=1),
+    Setting('retention_days', 'store', 'retention_days', int, 30, minimum=1),
+    Setting('rss_request_delay', 'network', 'rss_request_delay', float, 1.0, minimum=0),
+    Setting('youtube_feed_url', 'network', 'youtube_feed_url', str, ''),
+)
+
+# Valeurs par défaut des champs de Config, définies une seule fois dans SCHEMA
+DEFAULTS: Dict[str, Any] = {setting.name: setting.default for setting in SCHEMA}
+
+# Sections et clés reconnues dans config.yaml (les autres sont signalées comme des fautes de frappe)
+SECTIONS: Dict[str, Tuple[str, ...]] = {}
+for _setting in SCHEMA:
+    if _setting.section:
+        SECTIONS[_setting.section] = SECTIONS.get(_setting.section, ()) + (_setting.key,)
+TOP_LEVEL_KEYS = tuple(setting.key for setting in SCHEMA if not setting.section) + tuple(SECTIONS) + ('recipients',)
+
+TRUE_VALUES = {'1', 'true', 'yes', 'on', 'oui'}
+FALSE_VALUES = {'0', 'false', 'no', 'off', 'non', ''}
+
+def coerce(setting: Setting, value: Any) -> Any:
+    """Convertir une valeur (YAML ou variable d'environnement) vers le type du paramètre"""
+    if setting.type is list:
+        if value is None:
+            return ()
+        if isinstance(value, str):
+            value = [part.strip() for part in value.split(',') if part.strip()]
+        if not isinstance(value, (list, tuple)):
+            raise ValueError("une liste est attendue")
+        return tuple(str(part) for part in value)
     
-    @property
-    def openai_api_key(self) -> str:
-        return self._config.get('openai', {}).get('api_key', '')
+    if setting.type is bool:
+        if isinstance(value, bool):
+            return value
+        text = str(value).strip().lower()
+        if text in TRUE_VALUES:
+            return True
+        if text in FALSE_VALUES:
+            return False
+        raise ValueError("un booléen est attendu")
     
-    @property
-    def openai_model(self) -> str:
-        return self._config.get('openai', {}).get('model', 'gpt-4o-mini')
+    if setting.type is Path:
+        return Path(value)
     
-    @property
-    def kindle_email(self) -> str:
-        return self._config.get('kindle', {}).get('email', '')
+    if setting.type is str:
+        return '' if value is None else str(value)
     
-    @property
-    def sender_email(self) -> str:
-        return self._config.get('kindle', {}).get('sender_email', '')
+    if isinstance(value, bool):
+        raise ValueError("un nombre est attendu")
+    if setting.type is int and isinstance(value, float) and not value.is_integer():
+        raise ValueError("un entier est attendu")
+    return setting.type(value)
+
+def schema_errors(data: Mapping[str, Any], label: str, allow_recipients: bool = True) -> List[str]:
+    """Lister les clés inconnues (fautes de frappe) et les sections mal formées d'un dictionnaire de configuration"""
+    errors = []
+    known = TOP_LEVEL_KEYS if allow_recipients else TOP_LEVEL_KEYS[:-1]
+    for key, value in data.items():
+        if key not in known:
+            errors.append(f"{label}: clé inconnue '{key}'{did_you_mean(key, known)}")
+        elif key in SECTIONS and value is not None and not isinstance(value, Mapping):
+            errors.append(f"{label}: la section '{key}' doit être un dictionnaire (reçu: {value!r})")
+        elif key in SECTIONS and value is not None:
+            for sub_key in value:
+                if sub_key not in SECTIONS[key]:
+                    errors.append(f"{label}: clé inconnue '{key}.{sub_key}'{did_you_mean(sub_key, SECTIONS[key])}")
+    return errors
+
+def did_you_mean(key: Any, candidates: Tuple[str, ...]) -> str:
+    """Suggestion de la clé connue la plus proche"""
+    matches = difflib.get_close_matches(str(key), candidates, n=1)
+    return f" (vouliez-vous dire '{matches[0]}'?)" if matches else ""
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Configuration validée et immuable du système d'apprentissage
     
-    @property
-    def smtp_config(self) -> Dict[str, Any]:
-        return self._config.get('kindle', {})
+    Priorité des sources: valeurs par défaut < config.yaml < variables
+    d'environnement < surcharge du destinataire (section `recipients`).
+    """
+    rss_feeds: Tuple[str, ...] = DEFAULTS['rss_feeds']
+    youtube_channels: Tuple[str, ...] = DEFAULTS['youtube_channels']
+    openai_api_key: str = DEFAULTS['openai_api_key']
+    openai_model: str = DEFAULTS['openai_model']
+    openai_base_url: str = DEFAULTS['openai_base_url']
+    kindle_email: str = DEFAULTS['kindle_email']
+    sender_email: str = DEFAULTS['sender_email']
+    smtp_server: str = DEFAULTS['smtp_server']
+    smtp_port: int = DEFAULTS['smtp_port']
+    smtp_password: str = DEFAULTS['smtp_password']
+    smtp_starttls: bool = DEFAULTS['smtp_starttls']
+    output_dir: Path = DEFAULTS['output_dir']
+    max_articles_per_feed: int = DEFAULTS['max_articles_per_feed']
+    max_video_summaries: int = DEFAULTS['max_video_summaries']
+    days_lookback: int = DEFAULTS['days_lookback']
+    output_format: str = DEFAULTS['output_format']
+    size_optimized: bool = DEFAULTS['size_optimized']
+    pdf_layout: str = DEFAULTS['pdf_layout']
+    max_volume_mb: float = DEFAULTS['max_volume_mb']
+    pdf_workers: int = DEFAULTS['pdf_workers']
+    store_enabled: bool = DEFAULTS['store_enabled']
+    store_path: Path = DEFAULTS['store_path']
+    poll_interval_minutes: int = DEFAULTS['poll_interval_minutes']
+    store_batch_size: int = DEFAULTS['store_batch_size']
+    retention_days: int = DEFAULTS['retention_days']
+    rss_request_delay: float = DEFAULTS['rss_request_delay']
+    youtube_feed_url: str = DEFAULTS['youtube_feed_url']
+    recipient: Optional[str] = None
     
-    @property
-    def output_dir(self) -> Path:
-        return Path(self._config.get('output', {}).get('output_dir', 'output'))
+    @classmethod
+    def load(cls, config_file: str = "config.yaml", recipient: Optional[str] = None,
+             environ: Optional[Mapping[str, str]] = None) -> "Config":
+        """Charger et valider la configuration depuis le fichier YAML"""
+        config_path = Path(config_file)
+        if config_path.exists():
+            try:
+                with open(config_path, 'r', encoding='utf-8') as f:
+                    data = yaml.load(f, Loader=YAML_LOADER) or {}
+            except yaml.YAMLError as e:
+                raise ConfigError(f"{config_path}: YAML invalide\n{e}") from e
+        else:
+            print(f"⚠️ Fichier de configuration introuvable ({config_path}), valeurs par défaut utilisées")
+            data = {}
+        
+        if not isinstance(data, dict):
+            raise ConfigError(f"{config_path}: un dictionnaire YAML est attendu")
+        return cls.from_dict(data, recipient=recipient, environ=environ)
     
-    @property
-    def max_articles_per_feed(self) -> int:
-        return self._config.get('output', {}).get('max_articles_per_feed', 3)
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any], recipient: Optional[str] = None,
+                  environ: Optional[Mapping[str, str]] = None) -> "Config":
+        """Compiler un dictionnaire de configuration en objet validé"""
+        environ = os.environ if environ is None else environ
+        errors: List[str] = schema_errors(data, 'config.yaml')
+        
+        recipients = data.get('recipients') or {}
+        if not isinstance(recipients, Mapping):
+            errors.append(f"config.yaml: la section 'recipients' doit être un dictionnaire (reçu: {recipients!r})")
+            recipients = {}
+        for name, recipient_data in recipients.items():
+            if recipient_data is None:
+                continue
+            if not isinstance(recipient_data, Mapping):
+                errors.append(f"recipients.{name}: un dictionnaire est attendu (reçu: {recipient_data!r})")
+            else:
+                errors += schema_errors(recipient_data, f'recipients.{name}', allow_recipients=False)
+        
+        overlay: Mapping[str, Any] = {}
+        if recipient is not None:
+            if recipient not in recipients:
+                errors.append(f"Destinataire inconnu: {recipient}")
+            elif isinstance(recipients[recipient], Mapping):
+                overlay = recipients[recipient]
+        
+        values: Dict[str, Any] = {}
+        for setting in SCHEMA:
+            value = setting.default
+            for source, label in ((data, 'config.yaml'), (environ, setting.env_var), (overlay, f'recipients.{recipient}')):
+                if source is environ:
+                    # Une variable exportée vide ne remplace pas la valeur du fichier
+                    if not environ.get(setting.env_var, '').strip():
+                        continue
+                    raw = environ[setting.env_var]
+                else:
+                    section = source.get(setting.section) if setting.section else source
+                    if not isinstance(section, Mapping) or setting.key not in section:
+                        continue
+                    raw = section[setting.key]
+                
+                try:
+                    value = coerce(setting, raw)
+                except (TypeError, ValueError) as e:
+                    errors.append(f"{label}: {setting.path} invalide ({e})")
+            
+            if setting.minimum is not None and isinstance(value, (int, float)) and value < setting.minimum:
+                errors.append(f"{setting.path} doit être >= {setting.minimum} (reçu: {value})")
+            if setting.choices and value not in setting.choices:
+                errors.append(f"{setting.path} doit valoir {' ou '.join(setting.choices)} (reçu: {value})")
+            values[setting.name] = value
+        
+        # La compaction ne doit pas supprimer ce qui reste à livrer: ces vidéos seraient résumées à nouveau
+        if values['retention_days'] < values['days_lookback']:
+            errors.append(
+                "store.retention_days doit être >= output.days_lookback "
+                f"(reçu: {values['retention_days']} < {values['days_lookback']})"
+            )
+        
+        if errors:
+            raise ConfigError("Configuration invalide:\n  - " + "\n  - ".join(errors))
+        
+        # Chaque destinataire a son propre répertoire de sortie et son propre stockage,
+        # sauf indication contraire: le contenu ingéré pour l'un n'est jamais livré à l'autre
+        if recipient is not None:
+            if 'output_dir' not in (overlay.get('output') or {}):
+                values['output_dir'] = values['output_dir'] / recipient
+            if 'path' not in (overlay.get('store') or {}):
+                values['store_path'] = values['store_path'].parent / recipient / values['store_path'].name
+        
+        return cls(recipient=recipient, **values)
     
-    @property
-    def max_video_summaries(self) -> int:
-        return self._config.get('output', {}).get('max_video_summaries', 2)
+    def __reduce__(self):
+        # Sérialisation compacte et indépendante de la version de Python (workers)
+        return (self.__class__, tuple(getattr(self, f.name) for f in fields(self)))
     
     @property
-    def days_lookback(self) -> int:
-        return self._config.get('output', {}).get('days_lookback', 2)
+    def max_volume_bytes(self) -> int:
+        return int(self.max_volume_mb * 1024 * 1024)
+
+# Chaque paramètre du schéma a son champ dans Config (et inversement, hors `recipient`)
+assert set(DEFAULTS) == {f.name for f in fields(Config)} - {'recipient'}, "Config et SCHEMA divergent"
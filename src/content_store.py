@@ -0,0 +1,214 @@
+"""
+Stockage local du contenu
+Conserve les articles et vidéos collectés en continu dans une base SQLite indexée
+"""
+
+import hashlib
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from .dates import ensure_utc, utc_now
+from .rss_aggregator import Article
+from .youtube_summarizer import VideoSummary
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    url_hash TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL DEFAULT '',
+    summary TEXT NOT NULL DEFAULT '',
+    source TEXT NOT NULL,
+    channel_name TEXT NOT NULL DEFAULT '',
+    published TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    feed TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_items_published ON items (published);
+CREATE INDEX IF NOT EXISTS idx_items_source ON items (source);
+CREATE INDEX IF NOT EXISTS idx_items_kind_published ON items (kind, published);
+"""
+
+KIND_ARTICLE = "article"
+KIND_VIDEO = "video"
+
+def to_db(value: datetime) -> str:
+    """Format de date stocké: UTC à la seconde, pour que l'ordre des chaînes soit chronologique"""
+    return ensure_utc(value).isoformat(timespec='seconds')
+
+def url_hash(url: str) -> str:
+    """Calculer l'empreinte d'une URL (clé de déduplication)"""
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+class ContentStore:
+    """Base locale des éléments de contenu collectés"""
+    
+    def __init__(self, db_path: Path, batch_size: int = 50):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = max(1, batch_size)
+        self._pending: List[tuple] = []
+        
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+    
+    def add_item(self, item, feed: str = "") -> int:
+        """Ajouter un article ou un résumé vidéo (écriture différée par lots)
+        
+        `feed` est l'URL du flux RSS ou l'ID de la chaîne YouTube d'origine.
+        Retourne le nombre de nouveaux éléments écrits si un lot a été vidé.
+        """
+        if isinstance(item, VideoSummary):
+            row = (
+                url_hash(item.url), item.url, KIND_VIDEO, item.title, "",
+                item.summary, item.source, item.channel_name,
+                to_db(item.published), to_db(utc_now()), feed
+            )
+        else:
+            row = (
+                url_hash(item.url), item.url, KIND_ARTICLE, item.title, item.content,
+                item.summary, item.source, "",
+                to_db(item.published), to_db(utc_now()), feed
+            )
+        
+        self._pending.append(row)
+        if len(self._pending) >= self.batch_size:
+            return self.flush()
+        return 0
+    
+    def add_items(self, items: List, feed: str = "") -> int:
+        """Ajouter plusieurs éléments d'une même source"""
+        return sum(self.add_item(item, feed) for item in items)
+    
+    def flush(self) -> int:
+        """Écrire les éléments en attente dans une seule transaction
+        
+        Retourne le nombre d'éléments réellement insérés (hors doublons).
+        """
+        if not self._pending:
+            return 0
+        
+        rows, self._pending = self._pending, []
+        with self.conn:
+            # Les éléments déjà connus (même URL) sont ignorés
+            cursor = self.conn.executemany(
+                "INSERT OR IGNORE INTO items (url_hash, url, kind, title, content, summary, source, "
+                "channel_name, published, fetched_at, feed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        return cursor.rowcount
+    
+    def get_articles(self, since: datetime, limit: Optional[int] = None, feeds: Optional[Iterable[str]] = None,
+                     per_feed: Optional[int] = None) -> List[Article]:
+        """Obtenir les articles publiés depuis une date (plus récent en premier)
+        
+        `feeds` restreint aux flux donnés, `per_feed` limite le nombre d'articles de chaque flux.
+        """
+        rows = self._query(KIND_ARTICLE, since, limit, feeds, per_feed)
+        return [
+            Article(
+                title=row['title'],
+                content=row['content'],
+                url=row['url'],
+                published=ensure_utc(datetime.fromisoformat(row['published'])),
+                source=row['source'],
+                summary=row['summary']
+            )
+            for row in rows
+        ]
+    
+    def get_video_summaries(self, since: datetime, limit: Optional[int] = None,
+                            channels: Optional[Iterable[str]] = None,
+                            per_channel: Optional[int] = None) -> List[VideoSummary]:
+        """Obtenir les résumés vidéos publiés depuis une date (plus récent en premier)"""
+        rows = self._query(KIND_VIDEO, since, limit, channels, per_channel)
+        return [
+            VideoSummary(
+                title=row['title'],
+                summary=row['summary'],
+                url=row['url'],
+                published=ensure_utc(datetime.fromisoformat(row['published'])),
+                source=row['source'],
+                channel_name=row['channel_name']
+            )
+            for row in rows
+        ]
+    
+    def _query(self, kind: str, since: datetime, limit: Optional[int], feeds: Optional[Iterable[str]] = None,
+               per_feed: Optional[int] = None) -> List[sqlite3.Row]:
+        """Requête indexée sur (kind, published)"""
+        self.flush()
+        sql = "SELECT * FROM items WHERE kind = ? AND published >= ?"
+        params: list = [kind, to_db(since)]
+        if feeds is not None:
+            feeds = list(feeds)
+            sql += f" AND feed IN ({', '.join('?' * len(feeds))})"
+            params += feeds
+        if per_feed is not None:
+            # Comme en mode direct: un flux très actif ne doit pas évincer les autres
+            sql = (
+                "SELECT * FROM (SELECT *, ROW_NUMBER() OVER (PARTITION BY feed ORDER BY published DESC) "
+                f"AS feed_rank FROM ({sql})) WHERE feed_rank <= ?"
+            )
+            params.append(per_feed)
+        sql += " ORDER BY published DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        
+        self.conn.row_factory = sqlite3.Row
+        try:
+            return self.conn.execute(sql, params).fetchall()
+        finally:
+            self.conn.row_factory = None
+    
+    def __contains__(self, url: str) -> bool:
+        """Vérifier si une URL est déjà stockée"""
+        row = self.conn.execute(
+            "SELECT 1 FROM items WHERE url_hash = ?", (url_hash(url),)
+        ).fetchone()
+        return row is not None or any(pending[1] == url for pending in self._pending)
+    
+    def compact(self, retention_days: int) -> int:
+        """Supprimer les éléments plus anciens que la rétention et compacter la base"""
+        self.flush()
+        cutoff = utc_now() - timedelta(days=retention_days)
+        with self.conn:
+            cursor = self.conn.execute(
+                "DELETE FROM items WHERE published < ?", (to_db(cutoff),)
+            )
+        removed = cursor.rowcount
+        
+        # Récupérer l'espace disque et rafraîchir les statistiques des index
+        self.conn.execute("VACUUM")
+        self.conn.execute("ANALYZE")
+        return removed
+    
+    def get_meta(self, key: str) -> Optional[str]:
+        """Lire une valeur de la table `meta` (état persistant de l'ingestion)"""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+    
+    def set_meta(self, key: str, value: str) -> None:
+        """Écrire une valeur dans la table `meta`"""
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+    
+    def count(self) -> int:
+        """Nombre total d'éléments stockés"""
+        self.flush()
+        return self.conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+    
+    def close(self) -> None:
+        """Écrire les éléments en attente et fermer la base"""
+        self.flush()
+        self.conn.close()
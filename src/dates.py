@@ -0,0 +1,125 @@
+"""
+Normalisation des dates
+Convertit les dates des flux en datetimes UTC conscients du fuseau horaire
+"""
+
+import calendar
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+UTC = timezone.utc
+
+# Durée de mémorisation de la première apparition d'une entrée sans date
+FIRST_SEEN_RETENTION = timedelta(days=90)
+
+def utc_now() -> datetime:
+    """Date et heure courantes en UTC"""
+    return datetime.now(UTC)
+
+def cutoff(days: int) -> datetime:
+    """Date limite des éléments récents"""
+    return utc_now() - timedelta(days=days)
+
+def ensure_utc(value: datetime) -> datetime:
+    """Convertir en UTC (une date naïve est considérée comme déjà en UTC)"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value.astimezone(UTC)
+
+def parse_iso(text: str) -> Optional[datetime]:
+    """Parser une date ISO 8601 (ex: flux Atom YouTube) en UTC"""
+    if not text:
+        return None
+    text = text.strip()
+    if text.endswith('Z'):
+        text = text[:-1] + '+00:00'
+    try:
+        return ensure_utc(datetime.fromisoformat(text))
+    except ValueError:
+        return None
+
+@lru_cache(maxsize=8192)
+def struct_to_utc(parsed: Tuple[int, ...]) -> datetime:
+    """Convertir un struct_time de feedparser (toujours exprimé en UTC)"""
+    return datetime.fromtimestamp(calendar.timegm(parsed), UTC)
+
+class DateNormalizer:
+    """Dates de publication des entrées d'un flux, normalisées une seule fois
+    
+    Les entrées sans date reçoivent la date de leur première apparition,
+    mémorisée d'une exécution à l'autre: elles ne sont nouvelles qu'une fois.
+    """
+    
+    def __init__(self, state_path: Optional[Path] = None):
+        self.state_path = Path(state_path) if state_path else None
+        self._first_seen: Dict[str, datetime] = {}
+        self._dirty = False
+        self.load()
+    
+    def load(self):
+        """Lire les premières apparitions mémorisées"""
+        if not self.state_path or not self.state_path.exists():
+            return
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._first_seen = {key: datetime.fromisoformat(value) for key, value in data.items()}
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Dates de première apparition illisibles ({self.state_path}): {e}")
+    
+    def save(self):
+        """Écrire les premières apparitions (en oubliant les plus anciennes)"""
+        if not self.state_path or not self._dirty:
+            return
+        oldest = utc_now() - FIRST_SEEN_RETENTION
+        data = {key: value.isoformat() for key, value in self._first_seen.items() if value >= oldest}
+        
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.state_path)
+        self._dirty = False
+    
+    @staticmethod
+    def entry_key(entry: Any) -> str:
+        """Identifiant stable d'une entrée"""
+        return getattr(entry, 'id', None) or getattr(entry, 'link', None) or getattr(entry, 'title', '')
+    
+    def published(self, entry: Any, now: Optional[datetime] = None) -> datetime:
+        """Date de publication d'une entrée (feedparser ou déjà parsée) en UTC"""
+        published = getattr(entry, 'published', None)
+        if isinstance(published, datetime):
+            return ensure_utc(published)
+        
+        for field in ('published_parsed', 'updated_parsed'):
+            parsed = getattr(entry, field, None)
+            if parsed:
+                return struct_to_utc(tuple(parsed[:9]))
+        
+        # Pas de date: utiliser (et mémoriser) la première apparition
+        key = self.entry_key(entry)
+        first_seen = self._first_seen.get(key)
+        if first_seen is None:
+            first_seen = self._first_seen[key] = now or utc_now()
+            self._dirty = True
+        return first_seen
+    
+    def normalize(self, entries: Sequence[Any]) -> List[datetime]:
+        """Dates de publication de toutes les entrées d'un flux"""
+        now = utc_now()
+        return [self.published(entry, now) for entry in entries]
+    
+    def recent(self, entries: Sequence[Any], since: datetime, limit: Optional[int] = None) -> List[Tuple[Any, datetime]]:
+        """Entrées publiées depuis `since`, les plus récentes en premier"""
+        dated = [
+            (entry, published)
+            for entry, published in zip(entries, self.normalize(entries))
+            if published >= since
+        ]
+        dated.sort(key=lambda pair: pair[1], reverse=True)
+        return dated[:limit] if limit is not None else dated
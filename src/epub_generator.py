@@ -0,0 +1,184 @@
+"""
+Générateur d'EPUB
+Génère un journal EPUB (XHTML zippé) léger, qui se redimensionne sur Kindle
+"""
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+from xml.sax.saxutils import escape, quoteattr
+import re
+import uuid
+import zipfile
+
+from .journal_generator import JournalGenerator
+
+CONTAINER_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">
+  <rootfiles>
+    <rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/>
+  </rootfiles>
+</container>
+"""
+
+STYLESHEET = """body { font-family: serif; margin: 0 0.5em; }
+h1 { text-align: center; color: #1a3c8c; }
+h2 { font-size: 1.2em; margin: 1.2em 0 0.3em; }
+p.date, p.footer { text-align: center; color: #666; }
+p.meta { font-size: 0.8em; color: #666; margin: 0 0 0.6em; }
+p.link { font-size: 0.8em; word-wrap: break-word; }
+table { border-collapse: collapse; }
+td { border: 1px solid #000; padding: 0.2em 0.6em; }
+"""
+
+XHTML_HEADER = """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE html>
+<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops" lang="fr" xml:lang="fr">
+<head><meta charset="UTF-8"/><title>{title}</title><link rel="stylesheet" type="text/css" href="style.css"/></head>
+<body>
+"""
+
+XHTML_FOOTER = "</body>\n</html>\n"
+
+# Caractères de contrôle interdits en XML 1.0: une page qui en contient est rejetée par le Kindle
+INVALID_XML_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+def strip_invalid_xml(text: str) -> str:
+    """Supprimer les caractères interdits en XML (ex: \\x08 dans un flux RSS)"""
+    return INVALID_XML_CHARS.sub('', text)
+
+def xml_escape(text: str) -> str:
+    """Échapper un texte pour le XHTML, sans caractère interdit"""
+    return escape(strip_invalid_xml(text))
+
+class EPUBGenerator(JournalGenerator):
+    """Générateur d'EPUB sans mise en page: le rendu est laissé à la liseuse"""
+    
+    extension = "epub"
+    
+    def create_journal(self, content_items: List, volume: Optional[int] = None,
+                       total_volumes: Optional[int] = None, first_index: int = 1) -> Path:
+        """Créer un journal EPUB avec tous les éléments de contenu"""
+        filepath = self.journal_path(volume, total_volumes)
+        
+        title = "Journal d'Apprentissage"
+        date_text = datetime.now().strftime('%d %B %Y')
+        if volume:
+            date_text += f" - Volume {volume}/{total_volumes}"
+        
+        with zipfile.ZipFile(filepath, 'w', compression=zipfile.ZIP_DEFLATED) as epub:
+            # Le fichier mimetype doit être le premier, non compressé
+            epub.writestr(zipfile.ZipInfo('mimetype'), 'application/epub+zip', compress_type=zipfile.ZIP_STORED)
+            epub.writestr('META-INF/container.xml', CONTAINER_XML)
+            epub.writestr('OEBPS/style.css', STYLESHEET)
+            
+            epub.writestr('OEBPS/title.xhtml', self.render_title_page(title, date_text, content_items))
+            
+            # Une page XHTML par élément, écrite directement dans l'archive
+            chapters = []
+            for offset, item in enumerate(content_items):
+                index = first_index + offset
+                name = f"item_{index:04d}.xhtml"
+                with epub.open(f'OEBPS/{name}', 'w') as chapter:
+                    self.write_item(chapter, item, index)
+                chapters.append((name, f"{index}. {item.title}"))
+            
+            identifier = uuid.uuid5(uuid.NAMESPACE_URL, filepath.name).urn
+            epub.writestr('OEBPS/nav.xhtml', self.render_nav(title, chapters))
+            epub.writestr('OEBPS/toc.ncx', self.render_ncx(identifier, title, chapters))
+            epub.writestr('OEBPS/content.opf', self.render_opf(identifier, f"{title} - {date_text}", chapters))
+        
+        print(f"📄 EPUB généré: {filepath}")
+        return filepath
+    
+    def render_title_page(self, title: str, date_text: str, content_items: List) -> str:
+        """Page de titre avec le résumé du contenu"""
+        articles_count, videos_count = self.count_items(content_items)
+        return (
+            XHTML_HEADER.format(title=xml_escape(title))
+            + f"<h1>📚 {xml_escape(title)}</h1>\n"
+            + f'<p class="date">{xml_escape(date_text)}</p>\n'
+            + "<h2>📋 Contenu d'aujourd'hui</h2>\n<table>\n"
+            + f"<tr><td>📰 Articles RSS</td><td>{articles_count} articles</td></tr>\n"
+            + f"<tr><td>🎥 Résumés vidéos</td><td>{videos_count} vidéos</td></tr>\n"
+            + f"<tr><td>📖 Total</td><td>{len(content_items)} éléments</td></tr>\n"
+            + "</table>\n"
+            + '<p class="footer">🤖 Généré automatiquement par le Système d\'Apprentissage Automatique</p>\n'
+            + XHTML_FOOTER
+        )
+    
+    def write_item(self, stream, item, index: int):
+        """Écrire la page XHTML d'un élément de contenu"""
+        parts = [
+            XHTML_HEADER.format(title=xml_escape(item.title)),
+            f"<h2>{index}. {xml_escape(item.title)}</h2>\n",
+            f'<p class="meta">{xml_escape(self.source_info(item))}</p>\n',
+        ]
+        parts += [f"<p>{xml_escape(para)}</p>\n" for para in self.content_paragraphs(item)]
+        
+        # Lien cliquable à la place du QR code
+        if hasattr(item, 'url') and item.url:
+            parts.append(f'<p class="link">🔗 <a href={quoteattr(strip_invalid_xml(item.url))}>{xml_escape(item.url)}</a></p>\n')
+        
+        parts.append(XHTML_FOOTER)
+        stream.write(''.join(parts).encode('utf-8'))
+    
+    def render_nav(self, title: str, chapters: List) -> str:
+        """Table des matières EPUB 3"""
+        entries = ''.join(
+            f'<li><a href="{name}">{xml_escape(label)}</a></li>\n' for name, label in chapters
+        )
+        return (
+            XHTML_HEADER.format(title=xml_escape(title))
+            + '<nav epub:type="toc" id="toc">\n<h1>Sommaire</h1>\n<ol>\n'
+            + '<li><a href="title.xhtml">Résumé du contenu</a></li>\n'
+            + entries
+            + "</ol>\n</nav>\n"
+            + XHTML_FOOTER
+        )
+    
+    def render_ncx(self, identifier: str, title: str, chapters: List) -> str:
+        """Table des matières NCX (compatibilité avec les anciennes liseuses)"""
+        points = ''.join(
+            f'<navPoint id="nav{order}" playOrder="{order}"><navLabel><text>{xml_escape(label)}</text></navLabel>'
+            f'<content src="{name}"/></navPoint>\n'
+            for order, (name, label) in enumerate(chapters, 2)
+        )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<ncx xmlns="http://www.daisy.org/z3986/2005/ncx/" version="2005-1">\n'
+            f'<head><meta name="dtb:uid" content="{xml_escape(identifier)}"/></head>\n'
+            f'<docTitle><text>{xml_escape(title)}</text></docTitle>\n<navMap>\n'
+            '<navPoint id="nav1" playOrder="1"><navLabel><text>Résumé du contenu</text></navLabel>'
+            '<content src="title.xhtml"/></navPoint>\n'
+            + points
+            + "</navMap>\n</ncx>\n"
+        )
+    
+    def render_opf(self, identifier: str, title: str, chapters: List) -> str:
+        """Manifeste et ordre de lecture du livre"""
+        modified = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        manifest = ''.join(
+            f'<item id="item{i}" href="{name}" media-type="application/xhtml+xml"/>\n'
+            for i, (name, _) in enumerate(chapters)
+        )
+        spine = ''.join(f'<itemref idref="item{i}"/>\n' for i in range(len(chapters)))
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="uid" xml:lang="fr">\n'
+            '<metadata xmlns:dc="http://purl.org/dc/elements/1.1/">\n'
+            f'<dc:identifier id="uid">{xml_escape(identifier)}</dc:identifier>\n'
+            f'<dc:title>{xml_escape(title)}</dc:title>\n'
+            '<dc:language>fr</dc:language>\n'
+            '<dc:creator>Système d\'Apprentissage Automatique</dc:creator>\n'
+            f'<meta property="dcterms:modified">{modified}</meta>\n'
+            '</metadata>\n<manifest>\n'
+            '<item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>\n'
+            '<item id="ncx" href="toc.ncx" media-type="application/x-dtbncx+xml"/>\n'
+            '<item id="css" href="style.css" media-type="text/css"/>\n'
+            '<item id="title" href="title.xhtml" media-type="application/xhtml+xml"/>\n'
+            + manifest
+            + '</manifest>\n<spine toc="ncx">\n<itemref idref="title"/>\n'
+            + spine
+            + "</spine>\n</package>\n"
+        )
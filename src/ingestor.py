@@ -0,0 +1,112 @@
+"""
+Ingestion continue
+Interroge les flux tout au long de la journée et alimente le stockage local
+"""
+
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from .content_store import ContentStore
+from .dates import utc_now
+from .rss_aggregator import RSSAggregator
+from .youtube_summarizer import YouTubeSummarizer
+
+SOURCE_RSS = "rss"
+SOURCE_YOUTUBE = "youtube"
+
+# Clé de la table `meta` qui mémorise la dernière compaction (partagée entre les exécutions cron)
+META_LAST_COMPACTION = "last_compaction"
+
+class ContentIngestor:
+    """Collecte progressive du contenu vers le stockage local"""
+    
+    def __init__(self, config, store: Optional[ContentStore] = None):
+        self.config = config
+        self.store = store or ContentStore(config.store_path, config.store_batch_size)
+        self.rss_aggregator = RSSAggregator(config)
+        self.youtube_summarizer = YouTubeSummarizer(config)
+    
+    def sources(self) -> List[Tuple[str, str]]:
+        """Lister toutes les sources à interroger"""
+        sources = [(SOURCE_RSS, feed_url) for feed_url in self.config.rss_feeds]
+        if self.youtube_summarizer.client:
+            sources += [(SOURCE_YOUTUBE, channel_id) for channel_id in self.config.youtube_channels]
+        return sources
+    
+    def poll_source(self, kind: str, source: str) -> int:
+        """Interroger une source et stocker les nouveaux éléments
+        
+        Retourne le nombre d'éléments insérés par les lots écrits pendant l'appel;
+        le reste est compté par le `flush()` suivant.
+        """
+        try:
+            if kind == SOURCE_RSS:
+                items = self.rss_aggregator.process_feed(source)
+            else:
+                # Les vidéos déjà stockées ne sont pas résumées une seconde fois
+                items = self.youtube_summarizer.process_channel(source, exclude=self.store)
+        except Exception as e:
+            print(f"⚠️ Erreur lors de l'ingestion de {source}: {e}")
+            return 0
+        
+        return self.store.add_items(items, feed=source)
+    
+    def run_once(self) -> int:
+        """Interroger toutes les sources une fois et retourner le nombre d'éléments insérés"""
+        inserted = 0
+        for kind, source in self.sources():
+            print(f"📡 Ingestion: {source}")
+            inserted += self.poll_source(kind, source)
+        inserted += self.store.flush()
+        self.compact_if_due()
+        return inserted
+    
+    def run_forever(self):
+        """Interroger les sources en continu, réparties sur l'intervalle de polling"""
+        interval = self.config.poll_interval_minutes * 60
+        print(f"🔁 Ingestion continue (cycle de {self.config.poll_interval_minutes} min)")
+        
+        try:
+            while True:
+                sources = self.sources()
+                if not sources:
+                    print("⚠️ Aucune source configurée")
+                    return
+                
+                # Étaler les requêtes pour éviter les pics de charge réseau
+                spacing = interval / len(sources)
+                inserted = 0
+                for kind, source in sources:
+                    started = time.monotonic()
+                    inserted += self.poll_source(kind, source)
+                    time.sleep(max(0.0, spacing - (time.monotonic() - started)))
+                
+                inserted += self.store.flush()
+                if inserted:
+                    print(f"📥 {inserted} nouvel(s) élément(s) ingéré(s)")
+                self.compact_if_due()
+        except KeyboardInterrupt:
+            print("🛑 Ingestion interrompue")
+        finally:
+            self.store.close()
+    
+    def last_compaction(self) -> Optional[datetime]:
+        """Date de la dernière compaction, mémorisée dans la base"""
+        value = self.store.get_meta(META_LAST_COMPACTION)
+        try:
+            return datetime.fromisoformat(value) if value else None
+        except ValueError:
+            return None
+    
+    def compact_if_due(self):
+        """Appliquer la rétention au plus une fois par jour, y compris avec `--ingest-once`"""
+        now = utc_now()
+        last_compaction = self.last_compaction()
+        if last_compaction and now - last_compaction < timedelta(days=1):
+            return
+        
+        removed = self.store.compact(self.config.retention_days)
+        self.store.set_meta(META_LAST_COMPACTION, now.isoformat())
+        if removed:
+            print(f"🧹 {removed} élément(s) expiré(s) supprimé(s) du stockage")
@@ -0,0 +1,123 @@
+"""
+Interface commune des générateurs de journal
+Découpage en volumes et helpers partagés par les moteurs PDF et EPUB
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+import math
+
+from .kindle_sender import encoded_attachment_size
+
+class JournalGenerator(ABC):
+    """Classe de base des moteurs de sortie du journal"""
+    
+    extension = ""
+    
+    def __init__(self, config):
+        self.config = config
+        self.output_dir = config.output_dir
+        self.output_dir.mkdir(exist_ok=True)
+    
+    @abstractmethod
+    def create_journal(self, content_items: List, volume: Optional[int] = None,
+                       total_volumes: Optional[int] = None, first_index: int = 1) -> Path:
+        """Créer un journal avec tous les éléments de contenu"""
+    
+    def journal_path(self, volume: Optional[int] = None, total_volumes: Optional[int] = None) -> Path:
+        """Chemin du journal du jour (ou d'un de ses volumes)"""
+        today = datetime.now().strftime("%Y-%m-%d")
+        suffix = f"_vol{volume}sur{total_volumes}" if volume else ""
+        return self.output_dir / f"journal_apprentissage_{today}{suffix}.{self.extension}"
+    
+    def create_journal_volumes(self, content_items: List) -> List[Path]:
+        """Créer le journal, découpé en volumes si le budget de taille est dépassé"""
+        filepath = self.create_journal(content_items)
+        budget = self.config.max_volume_bytes
+        
+        if not self.config.size_optimized or len(content_items) <= 1 or self.attachment_size(filepath) <= budget:
+            self.report_volumes([filepath])
+            return [filepath]
+        
+        # Estimer le nombre de volumes, puis l'augmenter tant qu'un volume dépasse le budget
+        total = max(2, math.ceil(self.attachment_size(filepath) / budget))
+        filepath.unlink()
+        
+        while True:
+            chunks = self.split_items(content_items, total)
+            volumes, first_index = [], 1
+            for i, chunk in enumerate(chunks, 1):
+                volumes.append(self.create_journal(chunk, volume=i, total_volumes=len(chunks),
+                                                   first_index=first_index))
+                first_index += len(chunk)
+            largest = max(self.attachment_size(path) for path in volumes)
+            if largest <= budget or len(chunks) == len(content_items):
+                break
+            
+            for path in volumes:
+                path.unlink()
+            total = max(total + 1, math.ceil(total * largest / budget))
+        
+        self.report_volumes(volumes)
+        return volumes
+    
+    def split_items(self, content_items: List, total: int) -> List[List]:
+        """Répartir les éléments en `total` volumes consécutifs de taille équilibrée"""
+        total = min(total, len(content_items))
+        size, extra = divmod(len(content_items), total)
+        chunks, start = [], 0
+        for i in range(total):
+            end = start + size + (1 if i < extra else 0)
+            chunks.append(content_items[start:end])
+            start = end
+        return chunks
+    
+    def attachment_size(self, filepath: Path) -> int:
+        """Taille du fichier une fois encodé en pièce jointe"""
+        return encoded_attachment_size(filepath.stat().st_size)
+    
+    def report_volumes(self, volumes: List[Path]):
+        """Afficher la taille de chaque volume"""
+        if len(volumes) > 1:
+            print(f"📚 Journal découpé en {len(volumes)} volumes")
+        for i, path in enumerate(volumes, 1):
+            size = path.stat().st_size
+            print(f"📦 Volume {i}/{len(volumes)}: {path.name} - {size / 1024:.1f} KB "
+                  f"({self.attachment_size(path) / 1024:.1f} KB en pièce jointe)")
+    
+    def count_items(self, content_items: List):
+        """Compter les articles et les vidéos"""
+        videos_count = len([item for item in content_items if hasattr(item, 'source') and item.source == 'YouTube'])
+        articles_count = len([item for item in content_items if hasattr(item, 'source') and item.source != 'YouTube'])
+        return articles_count, videos_count
+    
+    @staticmethod
+    def source_info(item) -> str:
+        """Informations sur la source et la date (locale) d'un élément"""
+        published = item.published.astimezone().strftime('%d/%m/%Y')
+        if hasattr(item, 'source') and item.source == 'YouTube':
+            return f"🎥 {item.channel_name} | 📅 {published}"
+        return f"📰 {item.source} | 📅 {published}"
+    
+    @staticmethod
+    def content_paragraphs(item) -> List[str]:
+        """Paragraphes du contenu principal d'un élément"""
+        content_text = ""
+        if hasattr(item, 'summary') and item.summary:
+            content_text = item.summary
+        elif hasattr(item, 'content') and item.content:
+            content_text = item.content
+        
+        return [para.strip() for para in content_text.split('\n') if para.strip()]
+
+def create_generator(config) -> JournalGenerator:
+    """Instancier le moteur de sortie choisi dans la configuration"""
+    # Imports différés: le moteur EPUB ne nécessite pas ReportLab
+    if config.output_format == 'epub':
+        from .epub_generator import EPUBGenerator
+        return EPUBGenerator(config)
+    
+    from .pdf_generator import PDFGenerator
+    return PDFGenerator(config)
@@ -10,6 +10,12 @@ from email.mime.text import MIMEText
 from email import encoders
 from pathlib import Path
 from datetime import datetime
+import math
+
+def encoded_attachment_size(raw_size: int) -> int:
+    """Taille d'une pièce jointe après encodage base64 (lignes de 76 caractères + CRLF)"""
+    encoded = 4 * math.ceil(raw_size / 3)
+    return encoded + 2 * math.ceil(encoded / 76)
 
 class KindleSender:
     """Envoie du contenu vers Kindle via email"""
@@ -18,7 +24,7 @@ class KindleSender:
         self.config = config
     
     def send_to_kindle(self, pdf_path: Path) -> bool:
-        """Envoyer le PDF à l'adresse email Kindle"""
+        """Envoyer le journal (PDF ou EPUB) à l'adresse email Kindle"""
         if not self.config.kindle_email or not self.config.sender_email:
             print("⚠️ Email Kindle ou email expéditeur non configuré")
             print("ℹ️ Pour configurer:")
@@ -27,8 +33,7 @@ class KindleSender:
             print("   3. Notez votre adresse @kindle.com")
             return False
         
-        smtp_config = self.config.smtp_config
-        if not smtp_config.get('smtp_password'):
+        if not self.config.smtp_password:
             print("⚠️ Mot de passe SMTP non configuré")
             print("ℹ️ Pour Gmail, utilisez un mot de passe d'application:")
             print("   1. Activez la 2FA sur votre compte Google")
@@ -36,6 +41,14 @@ class KindleSender:
             print("   3. Utilisez ce mot de passe dans la configuration")
             return False
         
+        # Les serveurs mail limitent la taille du message encodé, pas celle du fichier
+        attachment_size = encoded_attachment_size(pdf_path.stat().st_size)
+        if attachment_size > self.config.max_volume_bytes:
+            print(f"❌ Pièce jointe trop volumineuse: {attachment_size / 1024 / 1024:.1f} MB "
+                  f"encodés (limite: {self.config.max_volume_bytes / 1024 / 1024:.0f} MB)")
+            print("ℹ️ Activez `size_optimized` dans config.yaml pour découper le journal en volumes")
+            return False
+        
         try:
             # Créer le message
             msg = MIMEMultipart()
@@ -43,17 +56,23 @@ class KindleSender:
             msg['To'] = self.config.kindle_email
             msg['Subject'] = f"Journal d'Apprentissage - {datetime.now().strftime('%d/%m/%Y')}"
             
+            # Le PDF renvoie aux sources par des QR codes, l'EPUB par des liens cliquables
+            if pdf_path.suffix == '.epub':
+                links = "Des liens cliquables vers les sources originales"
+            else:
+                links = "Des QR codes pour accéder aux sources originales"
+            
             # Corps de l'email
             body = f"""
 📚 Votre journal d'apprentissage quotidien est en pièce jointe !
 
-Ce PDF contient :
+Ce journal contient :
 • Les derniers articles de vos flux RSS
 • Des résumés IA des vidéos récentes
-• Des QR codes pour accéder aux sources originales
+• {links}
 
 Date : {datetime.now().strftime('%d %B %Y')}
-Taille du fichier : {pdf_path.stat().st_size / 1024:.1f} KB
+Taille du fichier : {pdf_path.stat().st_size / 1024:.1f} KB ({attachment_size / 1024:.1f} KB encodé)
 
 Bonne lecture ! 🧠✨
 
@@ -76,9 +95,10 @@ Généré automatiquement par votre Système d'Apprentissage
             
             # Envoyer l'email
             print(f"📧 Connexion au serveur SMTP...")
-            server = smtplib.SMTP(smtp_config['smtp_server'], smtp_config['smtp_port'])
-            server.starttls()
-            server.login(smtp_config['sender_email'], smtp_config['smtp_password'])
+            server = smtplib.SMTP(self.config.smtp_server, self.config.smtp_port)
+            if self.config.smtp_starttls:
+                server.starttls()
+            server.login(self.config.sender_email, self.config.smtp_password)
             
             print(f"📤 Envoi vers {self.config.kindle_email}...")
             server.send_message(msg)
@@ -4,31 +4,104 @@ Génère un journal PDF formaté avec des QR codes pour chaque article
 """
 
 import qrcode
+from reportlab import rl_config
 from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Image, Spacer, PageBreak, Table, TableStyle
+from reportlab.platypus import (
+    SimpleDocTemplate, Paragraph, Image, Spacer, PageBreak, CondPageBreak, Table, TableStyle
+)
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch, cm
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
 from reportlab.lib.colors import black, blue, grey
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
 from io import BytesIO
 from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional
+from xml.sax.saxutils import escape
+import os
 import textwrap
+import threading
 
-class PDFGenerator:
+from .journal_generator import JournalGenerator
+
+# En dessous de ce nombre d'éléments, le démarrage des processus coûte plus qu'il ne rapporte
+PARALLEL_MIN_ITEMS = 32
+
+# rl_config est global à ReportLab: un seul build modifie useA85 à la fois
+_RL_CONFIG_LOCK = threading.Lock()
+
+@dataclass
+class PreparedItem:
+    """Données d'un élément prêtes à être assemblées en flowables (sérialisables)"""
+    title: str
+    source_info: str
+    paragraphs: List[str]
+    url: str = ""
+    qr_png: Optional[bytes] = None
+
+def render_qr_png(url: str) -> bytes:
+    """Encoder le QR code d'une URL en PNG"""
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=4,
+        border=2,
+    )
+    qr.add_data(url)
+    qr.make(fit=True)
+    
+    # Niveaux de gris: ReportLab intègre les images 1 bit en RGB, trois fois plus lourd
+    qr_img = qr.make_image(fill_color="black", back_color="white").convert('L')
+    
+    # Convertir en PNG
+    buffer = BytesIO()
+    qr_img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+def prepare_item(item, render_qr: bool = True) -> PreparedItem:
+    """Préparer un élément: échappement du balisage et matrice QR (exécutable dans un worker)"""
+    url = item.url if hasattr(item, 'url') and item.url else ""
+    return PreparedItem(
+        title=escape(item.title),
+        source_info=escape(JournalGenerator.source_info(item)),
+        paragraphs=[escape(para) for para in JournalGenerator.content_paragraphs(item)],
+        url=escape(url),
+        qr_png=render_qr_png(url) if url and render_qr else None
+    )
+
+@contextmanager
+def binary_streams(enabled: bool = True):
+    """Écrire les flux du PDF en binaire au lieu d'ASCII85 (qui ajoute 25% à chaque flux)"""
+    if not enabled:
+        yield
+        return
+    with _RL_CONFIG_LOCK:
+        use_a85 = rl_config.useA85
+        rl_config.useA85 = 0
+        try:
+            yield
+        finally:
+            rl_config.useA85 = use_a85
+
+class PDFGenerator(JournalGenerator):
     """Générateur de PDF avec QR codes"""
     
+    extension = "pdf"
+    
     def __init__(self, config):
-        self.config = config
-        self.output_dir = config.output_dir
-        self.output_dir.mkdir(exist_ok=True)
+        super().__init__(config)
+        self.compact = config.pdf_layout == 'compact'
+        # PNG des QR codes par URL: une même URL donne une image identique,
+        # que ReportLab n'intègre qu'une seule fois dans le PDF
+        self._qr_cache: Dict[str, bytes] = {}
     
-    def create_journal(self, content_items: List) -> Path:
+    def create_journal(self, content_items: List, volume: Optional[int] = None,
+                       total_volumes: Optional[int] = None, first_index: int = 1) -> Path:
         """Créer un journal PDF avec tous les éléments de contenu"""
-        today = datetime.now().strftime("%Y-%m-%d")
-        filename = f"journal_apprentissage_{today}.pdf"
-        filepath = self.output_dir / filename
+        filepath = self.journal_path(volume, total_volumes)
         
         doc = SimpleDocTemplate(
             str(filepath), 
@@ -44,15 +117,17 @@ class PDFGenerator:
         
         # Titre du journal
         story.append(Paragraph(f"📚 Journal d'Apprentissage", styles['JournalTitle']))
-        story.append(Paragraph(f"{datetime.now().strftime('%d %B %Y')}", styles['DateStyle']))
-        story.append(Spacer(1, 20))
+        date_text = datetime.now().strftime('%d %B %Y')
+        if volume:
+            date_text += f" - Volume {volume}/{total_volumes}"
+        story.append(Paragraph(date_text, styles['DateStyle']))
+        story.append(Spacer(1, 10 if self.compact else 20))
         
         # Résumé du contenu
         story.append(Paragraph("📋 Contenu d'aujourd'hui", styles['SectionHeader']))
         
         # Compter les types de contenu
-        articles_count = len([item for item in content_items if hasattr(item, 'source') and item.source != 'YouTube'])
-        videos_count = len([item for item in content_items if hasattr(item, 'source') and item.source == 'YouTube'])
+        articles_count, videos_count = self.count_items(content_items)
         
         summary_data = [
             ['📰 Articles RSS', f'{articles_count} articles'],
@@ -73,12 +148,13 @@ class PDFGenerator:
         ]))
         
         story.append(summary_table)
-        story.append(PageBreak())
+        story.append(CondPageBreak(6*cm) if self.compact else PageBreak())
         
-        # Ajouter chaque élément de contenu
-        for i, item in enumerate(content_items, 1):
-            self.add_content_item(story, item, i, styles)
-            if i < len(content_items):
+        # Ajouter chaque élément de contenu, préparé en parallèle puis assemblé dans l'ordre
+        prepared_items = self.prepare_items(content_items)
+        for i, (item, prepared) in enumerate(zip(content_items, prepared_items), 1):
+            self.add_content_item(story, item, first_index + i - 1, styles, prepared)
+            if i < len(content_items) and not self.compact:
                 story.append(PageBreak())
         
         # Footer avec informations
@@ -89,7 +165,8 @@ class PDFGenerator:
         ))
         
         # Construire le PDF
-        doc.build(story)
+        with binary_streams(self.config.size_optimized):
+            doc.build(story)
         print(f"📄 PDF généré: {filepath}")
         return filepath
     
@@ -132,8 +209,8 @@ class PDFGenerator:
             name='ArticleTitle',
             parent=styles['Heading3'],
             fontSize=14,
-            spaceAfter=8,
-            spaceBefore=15,
+            spaceAfter=4 if self.compact else 8,
+            spaceBefore=8 if self.compact else 15,
             textColor=black
         ))
         
@@ -142,7 +219,7 @@ class PDFGenerator:
             name='Metadata',
             parent=styles['Normal'],
             fontSize=9,
-            spaceAfter=10,
+            spaceAfter=4 if self.compact else 10,
             textColor=grey
         ))
         
@@ -151,7 +228,7 @@ class PDFGenerator:
             name='MainContent',
             parent=styles['Normal'],
             fontSize=11,
-            spaceAfter=15,
+            spaceAfter=6 if self.compact else 15,
             alignment=TA_LEFT,
             leading=14
         ))
@@ -167,40 +244,53 @@ class PDFGenerator:
         
         return styles
     
-    def add_content_item(self, story: List, item, index: int, styles):
-        """Ajouter un élément de contenu à l'histoire"""
-        # Titre avec index
-        story.append(Paragraph(f"{index}. {item.title}", styles['ArticleTitle']))
+    def prepare_items(self, content_items: List) -> List[PreparedItem]:
+        """Préparer les éléments, dans un pool de processus pour les gros journaux"""
+        # Les QR codes déjà en cache (reconstruction d'un volume) ne sont pas recalculés
+        render_qr = [getattr(item, 'url', None) not in self._qr_cache for item in content_items]
+        workers = self.config.pdf_workers or os.cpu_count() or 1
         
-        # Informations sur la source et la date
-        if hasattr(item, 'source') and item.source == 'YouTube':
-            source_info = f"🎥 {item.channel_name} | 📅 {item.published.strftime('%d/%m/%Y')}"
+        if workers > 1 and len(content_items) >= PARALLEL_MIN_ITEMS:
+            chunksize = max(1, len(content_items) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # map() conserve l'ordre des éléments: le journal reste déterministe
+                prepared_items = list(executor.map(prepare_item, content_items, render_qr, chunksize=chunksize))
         else:
-            source_info = f"📰 {item.source} | 📅 {item.published.strftime('%d/%m/%Y')}"
+            prepared_items = [prepare_item(item, qr) for item, qr in zip(content_items, render_qr)]
         
-        story.append(Paragraph(source_info, styles['Metadata']))
+        for item, prepared in zip(content_items, prepared_items):
+            if prepared.qr_png is not None:
+                self._qr_cache[item.url] = prepared.qr_png
+        return prepared_items
+    
+    def add_content_item(self, story: List, item, index: int, styles, prepared: Optional[PreparedItem] = None):
+        """Ajouter un élément de contenu à l'histoire"""
+        if prepared is None:
+            prepared = prepare_item(item, getattr(item, 'url', None) not in self._qr_cache)
+            if prepared.qr_png is not None:
+                self._qr_cache[item.url] = prepared.qr_png
         
-        # Contenu principal
-        content_text = ""
-        if hasattr(item, 'summary') and item.summary:
-            content_text = item.summary
-        elif hasattr(item, 'content') and item.content:
-            content_text = item.content
+        if self.compact:
+            # Éviter un titre isolé en bas de page sans saut de page systématique
+            story.append(CondPageBreak(4*cm))
         
-        if content_text:
-            # Diviser le contenu en paragraphes si nécessaire
-            paragraphs = content_text.split('\n')
-            for para in paragraphs:
-                if para.strip():
-                    story.append(Paragraph(para.strip(), styles['MainContent']))
+        # Titre avec index
+        story.append(Paragraph(f"{index}. {prepared.title}", styles['ArticleTitle']))
         
-        story.append(Spacer(1, 15))
+        # Informations sur la source et la date
+        story.append(Paragraph(prepared.source_info, styles['Metadata']))
+        
+        # Contenu principal, divisé en paragraphes
+        for para in prepared.paragraphs:
+            story.append(Paragraph(para, styles['MainContent']))
+        
+        story.append(Spacer(1, 4 if self.compact else 15))
         
         # QR Code et lien
-        if hasattr(item, 'url') and item.url:
+        if prepared.url:
             # Créer une table pour aligner le QR code et le texte
             qr_image = self.generate_qr_code(item.url)
-            url_text = f"🔗 Scanner pour visiter:<br/><font size=8>{item.url}</font>"
+            url_text = f"🔗 Scanner pour visiter:<br/><font size=8>{prepared.url}</font>"
             
             qr_table = Table(
                 [[qr_image, Paragraph(url_text, styles['Metadata'])]],
@@ -214,25 +304,13 @@ class PDFGenerator:
             
             story.append(qr_table)
         
-        story.append(Spacer(1, 20))
+        story.append(Spacer(1, 8 if self.compact else 20))
     
     def generate_qr_code(self, url: str) -> Image:
         """Générer un QR code pour l'URL"""
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=4,
-            border=2,
-        )
-        qr.add_data(url)
-        qr.make(fit=True)
-        
-        qr_img = qr.make_image(fill_color="black", back_color="white")
-        
-        # Convertir en BytesIO
-        buffer = BytesIO()
-        qr_img.save(buffer, format="PNG")
-        buffer.seek(0)
+        png = self._qr_cache.get(url)
+        if png is None:
+            png = self._qr_cache[url] = render_qr_png(url)
         
         # Créer une Image ReportLab
-        return Image(buffer, width=2*cm, height=2*cm)
+        return Image(BytesIO(png), width=2*cm, height=2*cm)
@@ -5,13 +5,15 @@ Collecte et traite les flux RSS
 
 import feedparser
 import requests
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from datetime import datetime
+from typing import List, Dict, Any, Iterable, Optional
 from dataclasses import dataclass
 import time
 import re
 import html
 
+from .dates import DateNormalizer, cutoff
+
 @dataclass
 class Article:
     """Structure de données pour un article"""
@@ -28,23 +30,32 @@ class RSSAggregator:
     def __init__(self, config):
         self.config = config
         self.articles: List[Article] = []
+        # Flux dont la récupération a échoué lors de la dernière collecte
+        self.failed_feeds: List[str] = []
+        self.dates = DateNormalizer(config.output_dir / "dates_rss.json")
     
-    def collect_articles(self) -> List[Article]:
-        """Collecter les articles de tous les flux RSS"""
-        all_articles = []
+    def collect_articles(self, feeds: Optional[Iterable[str]] = None, previous: Iterable[Article] = ()) -> List[Article]:
+        """Collecter les articles de tous les flux RSS
+        
+        Pour une reprise, `feeds` limite la collecte aux flux en échec et
+        `previous` apporte les articles déjà collectés.
+        """
+        all_articles = list(previous)
+        self.failed_feeds = []
         
         if not self.config.rss_feeds:
             print("⚠️ Aucun flux RSS configuré")
             return all_articles
         
-        for feed_url in self.config.rss_feeds:
+        for feed_url in (self.config.rss_feeds if feeds is None else feeds):
             try:
                 print(f"📡 Traitement du flux: {feed_url}")
                 articles = self.process_feed(feed_url)
                 all_articles.extend(articles)
-                time.sleep(1)  # Être respectueux avec les serveurs
+                time.sleep(self.config.rss_request_delay)  # Être respectueux avec les serveurs
             except Exception as e:
                 print(f"⚠️ Erreur lors du traitement du flux {feed_url}: {e}")
+                self.mark_failed(feed_url)
                 continue
         
         # Trier par date de publication (plus récent en premier)
@@ -54,6 +65,11 @@ class RSSAggregator:
         max_total = self.config.max_articles_per_feed * len(self.config.rss_feeds)
         return all_articles[:max_total]
     
+    def mark_failed(self, feed_url: str):
+        """Noter un flux à réessayer"""
+        if feed_url not in self.failed_feeds:
+            self.failed_feeds.append(feed_url)
+    
     def process_feed(self, feed_url: str) -> List[Article]:
         """Traiter un seul flux RSS"""
         try:
@@ -64,9 +80,11 @@ class RSSAggregator:
             
             # Récupérer le flux avec un timeout
             response = requests.get(feed_url, headers=headers, timeout=10)
+            response.raise_for_status()
             feed = feedparser.parse(response.content)
         except Exception as e:
             print(f"⚠️ Erreur lors de la récupération du flux {feed_url}: {e}")
+            self.mark_failed(feed_url)
             return []
         
         if not feed.entries:
@@ -76,22 +94,14 @@ class RSSAggregator:
         source_name = feed.feed.get('title', feed_url)
         articles = []
         
-        # Date limite (articles récents uniquement)
-        cutoff_date = datetime.now() - timedelta(days=self.config.days_lookback)
+        # Filtrer par date avant toute extraction de contenu (articles récents uniquement)
+        recent_entries = self.dates.recent(
+            feed.entries, cutoff(self.config.days_lookback), limit=self.config.max_articles_per_feed
+        )
+        self.dates.save()
         
-        for entry in feed.entries[:self.config.max_articles_per_feed]:
+        for entry, published in recent_entries:
             try:
-                # Parser la date de publication
-                published = datetime.now()
-                if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                    published = datetime(*entry.published_parsed[:6])
-                elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                    published = datetime(*entry.updated_parsed[:6])
-                
-                # Ignorer les articles trop anciens
-                if published < cutoff_date:
-                    continue
-                
                 # Obtenir le contenu
                 content = self.extract_content(entry)
                 
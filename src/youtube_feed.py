@@ -0,0 +1,105 @@
+"""
+Flux Atom YouTube
+Récupération concurrente des flux des chaînes et parsing rapide du schéma Atom YouTube
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from io import BytesIO
+from typing import Dict, Iterable, List, Optional
+import xml.etree.ElementTree as ET
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .dates import parse_iso
+
+FEED_URL = "https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+MAX_FETCH_WORKERS = 8
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+YT = '{http://www.youtube.com/xml/schemas/2015}'
+MEDIA = '{http://search.yahoo.com/mrss/}'
+
+@dataclass
+class YouTubeEntry:
+    """Entrée d'un flux YouTube, limitée aux champs utilisés"""
+    id: str
+    title: str
+    link: str
+    published: Optional[datetime] = None
+    description: str = ""
+
+@dataclass
+class ChannelFeed:
+    """Flux d'une chaîne YouTube"""
+    title: str = ""
+    entries: List[YouTubeEntry] = field(default_factory=list)
+
+def parse_channel_feed(data: bytes) -> ChannelFeed:
+    """Parser un flux Atom YouTube en une passe (iterparse), sans construire tout l'arbre"""
+    feed = ChannelFeed()
+    in_entry = False
+    
+    for event, elem in ET.iterparse(BytesIO(data), events=('start', 'end')):
+        tag = elem.tag
+        if event == 'start':
+            if tag == ATOM + 'entry':
+                in_entry = True
+            continue
+        
+        if tag == ATOM + 'entry':
+            video_id = elem.findtext(YT + 'videoId', '')
+            link = next(
+                (link.get('href', '') for link in elem.iter(ATOM + 'link') if link.get('rel', 'alternate') == 'alternate'),
+                f"https://www.youtube.com/watch?v={video_id}" if video_id else ''
+            )
+            feed.entries.append(YouTubeEntry(
+                id=elem.findtext(ATOM + 'id') or f"yt:video:{video_id}",
+                title=elem.findtext(ATOM + 'title', ''),
+                link=link,
+                published=parse_iso(elem.findtext(ATOM + 'published', '')),
+                description=elem.findtext(f'{MEDIA}group/{MEDIA}description', '')
+            ))
+            # Libérer l'entrée traitée: la mémoire reste constante quelle que soit la taille du flux
+            elem.clear()
+            in_entry = False
+        elif tag == ATOM + 'title' and not in_entry and not feed.title:
+            feed.title = elem.text or ''
+    
+    return feed
+
+def create_session(pool_size: int = MAX_FETCH_WORKERS) -> requests.Session:
+    """Session HTTP dont les connexions keep-alive sont partagées entre les requêtes"""
+    session = requests.Session()
+    session.headers['User-Agent'] = USER_AGENT
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+def fetch_channel_feed(session: requests.Session, channel_id: str, url_template: str = FEED_URL,
+                       timeout: int = 10) -> bytes:
+    """Télécharger le flux d'une chaîne"""
+    response = session.get(url_template.format(channel_id=channel_id), timeout=timeout)
+    response.raise_for_status()
+    return response.content
+
+def fetch_channel_feeds(session: requests.Session, channel_ids: Iterable[str], url_template: str = FEED_URL,
+                        max_workers: int = MAX_FETCH_WORKERS) -> Dict[str, Optional[bytes]]:
+    """Télécharger les flux de toutes les chaînes en parallèle (None en cas d'échec)"""
+    channel_ids = list(channel_ids)
+    
+    def fetch(channel_id: str) -> Optional[bytes]:
+        try:
+            return fetch_channel_feed(session, channel_id, url_template)
+        except Exception as e:
+            print(f"⚠️ Échec de la récupération du flux YouTube de la chaîne {channel_id}: {e}")
+            return None
+    
+    if not channel_ids:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(channel_ids))) as executor:
+        return dict(zip(channel_ids, executor.map(fetch, channel_ids)))
@@ -1,18 +1,18 @@
 """
 Résumeur de vidéos YouTube
-Traite les flux RSS YouTube et génère des résumés IA
+Traite les flux Atom YouTube et génère des résumés IA
 """
 
-import feedparser
-import requests
 from openai import OpenAI
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from datetime import datetime
+from typing import List, Dict, Any, Container, Iterable, Optional
 from dataclasses import dataclass
 import re
-import time
 import html
 
+from .dates import DateNormalizer, cutoff
+from .youtube_feed import FEED_URL, create_session, fetch_channel_feed, fetch_channel_feeds, parse_channel_feed
+
 @dataclass
 class VideoSummary:
     """Structure de données pour un résumé de vidéo"""
@@ -28,28 +28,51 @@ class YouTubeSummarizer:
     
     def __init__(self, config):
         self.config = config
-        self.client = OpenAI(api_key=config.openai_api_key) if config.openai_api_key else None
+        self.client = OpenAI(
+            api_key=config.openai_api_key, base_url=config.openai_base_url or None
+        ) if config.openai_api_key else None
+        self.feed_url_template = config.youtube_feed_url or FEED_URL
+        self.dates = DateNormalizer(config.output_dir / "dates_youtube.json")
+        self.session = create_session()
+        # Chaînes dont le flux ou au moins un résumé a échoué (à réessayer)
+        self.failed_channels: List[str] = []
     
-    def process_videos(self) -> List[VideoSummary]:
-        """Traiter les vidéos des chaînes YouTube"""
+    def process_videos(self, channels: Optional[Iterable[str]] = None,
+                       previous: Iterable[VideoSummary] = ()) -> List[VideoSummary]:
+        """Traiter les vidéos des chaînes YouTube
+        
+        Pour une reprise, `channels` limite le traitement aux chaînes en échec et
+        `previous` apporte les résumés déjà générés (qui ne sont pas refaits).
+        """
+        all_summaries = list(previous)
+        self.failed_channels = []
+        
         if not self.client:
             print("⚠️ Clé API OpenAI non configurée, résumés de vidéos ignorés")
-            return []
+            return all_summaries
         
         if not self.config.youtube_channels:
             print("ℹ️ Aucune chaîne YouTube configurée")
-            return []
+            return all_summaries
+        
+        channels = list(self.config.youtube_channels if channels is None else channels)
+        summarized = {summary.url for summary in all_summaries}
         
-        all_summaries = []
+        # Récupérer tous les flux en parallèle, sur les connexions partagées de la session
+        print(f"📡 Récupération des flux de {len(channels)} chaîne(s) YouTube...")
+        feeds = fetch_channel_feeds(self.session, channels, self.feed_url_template)
         
-        for channel_id in self.config.youtube_channels:
+        for channel_id, feed_data in feeds.items():
+            if feed_data is None:
+                self.mark_failed(channel_id)
+                continue
             try:
                 print(f"🎥 Traitement de la chaîne YouTube: {channel_id}")
-                summaries = self.process_channel(channel_id)
+                summaries = self.process_channel(channel_id, exclude=summarized, feed_data=feed_data)
                 all_summaries.extend(summaries)
-                time.sleep(2)  # Limitation du taux
             except Exception as e:
                 print(f"⚠️ Erreur lors du traitement de la chaîne {channel_id}: {e}")
+                self.mark_failed(channel_id)
                 continue
         
         # Trier par date de publication (plus récent en premier)
@@ -57,46 +80,42 @@ class YouTubeSummarizer:
         
         return all_summaries[:self.config.max_video_summaries]
     
-    def process_channel(self, channel_id: str) -> List[VideoSummary]:
-        """Traiter une seule chaîne YouTube"""
-        # URL du flux RSS YouTube
-        rss_url = f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
-        
+    def mark_failed(self, channel_id: str):
+        """Noter une chaîne à réessayer"""
+        if channel_id not in self.failed_channels:
+            self.failed_channels.append(channel_id)
+    
+    def process_channel(self, channel_id: str, exclude: Container[str] = (),
+                        feed_data: Optional[bytes] = None) -> List[VideoSummary]:
+        """Traiter une seule chaîne YouTube (les URLs de `exclude` ne sont pas résumées)"""
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-            }
-            response = requests.get(rss_url, headers=headers, timeout=10)
-            feed = feedparser.parse(response.content)
+            if feed_data is None:
+                feed_data = fetch_channel_feed(self.session, channel_id, self.feed_url_template)
+            feed = parse_channel_feed(feed_data)
         except Exception as e:
             print(f"⚠️ Échec du parsing du RSS YouTube pour la chaîne {channel_id}: {e}")
+            self.mark_failed(channel_id)
             return []
         
         if not feed.entries:
             print(f"⚠️ Aucune vidéo trouvée pour la chaîne: {channel_id}")
             return []
         
-        channel_name = feed.feed.get('title', f'Chaîne {channel_id}')
+        channel_name = feed.title or f'Chaîne {channel_id}'
         summaries = []
         
-        # Date limite (vidéos récentes uniquement)
-        cutoff_date = datetime.now() - timedelta(days=self.config.days_lookback)
+        # Filtrer par date avant tout appel à l'IA (vidéos récentes uniquement, max 2 par chaîne)
+        recent_entries = self.dates.recent(feed.entries, cutoff(self.config.days_lookback), limit=2)
+        self.dates.save()
         
-        for entry in feed.entries[:2]:  # Max 2 vidéos par chaîne
+        for entry, published in recent_entries:
             try:
-                # Parser la date de publication
-                published = datetime.now()
-                if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                    published = datetime(*entry.published_parsed[:6])
-                
-                # Ignorer les vidéos trop anciennes
-                if published < cutoff_date:
-                    continue
-                
                 # Obtenir les métadonnées de la vidéo
                 video_url = entry.link
+                if video_url in exclude:
+                    continue  # Déjà résumée, inutile de rappeler l'IA
                 video_title = self.clean_text(entry.title)
-                video_description = self.clean_text(entry.get('summary', ''))
+                video_description = self.clean_text(entry.description)
                 
                 # Générer le résumé avec l'IA
                 summary = self.generate_video_summary(video_title, video_description)
@@ -111,9 +130,12 @@ class YouTubeSummarizer:
                         channel_name=channel_name
                     )
                     summaries.append(video_summary)
+                else:
+                    self.mark_failed(channel_id)
                 
             except Exception as e:
                 print(f"⚠️ Erreur lors du traitement de la vidéo: {e}")
+                self.mark_failed(channel_id)
                 continue
         
         return summaries
@@ -146,8 +168,9 @@ class YouTubeSummarizer:
             return response.choices[0].message.content.strip()
             
         except Exception as e:
-            print(f"⚠️ Erreur lors de la génération du résumé: {e}")
-            return f"Résumé non disponible. Vidéo: {title}"
+            # Pas de résumé de remplacement: la vidéo sera résumée à la prochaine tentative
+            print(f"⚠️ Erreur lors de la génération du résumé de \"{title}\": {e}")
+            return ""
     
     def clean_text(self, text: str) -> str:
         """Nettoyer un texte"""